@@ -10,6 +10,7 @@ from .models import ProductCategory
 
 from .models import Restaurant
 from .models import RestaurantMenuItem
+from .models import DeliveryZone
 from .models import Order, OrderItem
 
 from django import forms
@@ -20,6 +21,11 @@ class RestaurantMenuItemInline(admin.TabularInline):
     extra = 0
 
 
+class DeliveryZoneInline(admin.TabularInline):
+    model = DeliveryZone
+    extra = 0
+
+
 @admin.register(Restaurant)
 class RestaurantAdmin(admin.ModelAdmin):
     search_fields = [
@@ -31,8 +37,9 @@ class RestaurantAdmin(admin.ModelAdmin):
         "name",
         "address",
         "contact_phone",
+        "capacity",
     ]
-    inlines = [RestaurantMenuItemInline]
+    inlines = [RestaurantMenuItemInline, DeliveryZoneInline]
 
 
 @admin.register(Product)
@@ -158,6 +165,7 @@ class OrderAdmin(admin.ModelAdmin):
         "phonenumber",
         "address",
         "formatted_date",
+        "total",
         "status",
         "comment",
         "payment_method",
@@ -172,6 +180,7 @@ class OrderAdmin(admin.ModelAdmin):
 
     readonly_fields = [
         "created_at",
+        "total",
     ]
 
     def response_change(self, request, obj):
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from foodcartapp.matching import match_orders
+from foodcartapp.models import Order, OrderEvent, Restaurant
+
+# Штраф за полную загрузку ресторана в километрах: при равной загрузке
+# выигрывает ближайший, а загруженный наполовину ресторан проигрывает
+# свободному, если тот дальше не больше чем на LOAD_WEIGHT / 2 км.
+DISTANCE_WEIGHT = 1.0
+LOAD_WEIGHT = 5.0
+
+
+def score_restaurant(distance, open_orders, capacity):
+    """Чем меньше, тем лучше."""
+    return DISTANCE_WEIGHT * distance + LOAD_WEIGHT * open_orders / capacity
+
+
+def choose_restaurant(matches, loads):
+    """Выбирает ресторан с наименьшим штрафом среди тех, где есть место.
+
+    matches — результат match_orders для одного заказа, loads —
+    {restaurant_id: число незавершённых заказов}.
+    """
+    best, best_score = None, None
+    for match in matches:
+        restaurant = match["restaurant"]
+        open_orders = loads.get(restaurant.id, 0)
+        if open_orders >= restaurant.capacity:
+            continue
+        score = score_restaurant(match["distance"], open_orders, restaurant.capacity)
+        if best_score is None or score < best_score:
+            best, best_score = restaurant, score
+    return best
+
+
+def assign_orders(batch_size=100):
+    """Назначает рестораны пачке новых заказов в одной транзакции.
+
+    Заказы берутся в порядке поступления и блокируются, чтобы параллельные
+    воркеры их не делили. Загрузка ресторанов учитывает уже назначенные
+    в этой пачке заказы. Заказы без координат остаются ждать. Заказ без
+    подходящего ресторана повторяется не раньше чем через
+    ORDER_ASSIGNMENT_RETRY_INTERVAL, чтобы такие заказы не заняли всю
+    пачку. Возвращает список назначенных заказов.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        orders = list(
+            Order.objects.ready_for_assignment(
+                retry_before=now - settings.ORDER_ASSIGNMENT_RETRY_INTERVAL
+            ).select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not orders:
+            return []
+
+        matches = match_orders(orders, radius_km=settings.DELIVERY_RADIUS_KM)
+        loads = dict(
+            Restaurant.objects.with_open_orders().values_list("id", "open_orders")
+        )
+        assigned, postponed = [], []
+        for order in orders:
+            restaurant = choose_restaurant(matches.get(order.id, []), loads)
+            if restaurant is None:
+                postponed.append(order.pk)
+                continue
+            order.restaurant = restaurant
+            loads[restaurant.id] = loads.get(restaurant.id, 0) + 1
+            assigned.append(order)
+        Order.objects.bulk_update(assigned, ["restaurant"])
+        Order.objects.filter(pk__in=postponed).update(assignment_attempted_at=now)
+        OrderEvent.objects.record(
+            [order.pk for order in assigned], OrderEvent.RESTAURANT_ASSIGNED
+        )
+    return assigned
@@ -0,0 +1,76 @@
+from django.conf import settings
+
+from foodcartapp.models import RestaurantMenuItem
+from foodcartapp.versions import get_versioned
+
+AVAILABILITY_VERSION = "availability"
+
+
+class AvailabilityMatrix:
+    """Матрица «товар × ресторан»: для каждого товара — битовая маска
+    ресторанов, где он сейчас в продаже.
+
+    Номер бита ресторана хранится в columns. Маски — обычные int, поэтому
+    пересечение меню по всем товарам заказа — это побитовое И.
+    """
+
+    def __init__(self, pairs=()):
+        self.columns = {}
+        self.restaurant_ids = []
+        self.rows = {}
+        for product_id, restaurant_id in pairs:
+            self.add(product_id, restaurant_id)
+
+    def add(self, product_id, restaurant_id):
+        column = self.columns.get(restaurant_id)
+        if column is None:
+            column = self.columns[restaurant_id] = len(self.restaurant_ids)
+            self.restaurant_ids.append(restaurant_id)
+        self.rows[product_id] = self.rows.get(product_id, 0) | 1 << column
+
+    def is_available(self, product_id, restaurant_id):
+        column = self.columns.get(restaurant_id)
+        return column is not None and bool(self.rows.get(product_id, 0) >> column & 1)
+
+    def row(self, product_id, restaurant_ids):
+        """Доступность товара в ресторанах restaurant_ids, в их порядке."""
+        mask = self.rows.get(product_id, 0)
+        columns = [self.columns.get(restaurant_id) for restaurant_id in restaurant_ids]
+        return [column is not None and bool(mask >> column & 1) for column in columns]
+
+    def restaurants_for(self, product_ids):
+        """Рестораны, в которых есть все товары product_ids."""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return set()
+        mask = -1
+        for product_id in product_ids:
+            mask &= self.rows.get(product_id, 0)
+            if not mask:
+                return set()
+        return {
+            restaurant_id
+            for restaurant_id, column in self.columns.items()
+            if mask >> column & 1
+        }
+
+
+def build_availability_matrix():
+    return AvailabilityMatrix(
+        RestaurantMenuItem.objects.filter(availability=True).values_list(
+            "product_id", "restaurant_id"
+        )
+    )
+
+
+def get_availability_matrix():
+    """Матрица доступности текущей версии меню.
+
+    Сигналы RestaurantMenuItem меняют версию, и матрица пересобирается
+    одним запросом.
+    """
+    return get_versioned(
+        AVAILABILITY_VERSION,
+        build_availability_matrix,
+        settings.CATALOGUE_CACHE_TIMEOUT,
+    )
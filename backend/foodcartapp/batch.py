@@ -0,0 +1,96 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from foodcartapp.models import Order, OrderEvent, OrderItem, Product
+from foodcartapp.serializers import OrderItemSerializer, OrderSerializer
+from geocoder.normalize import canonical_address
+from geocoder.tasks import enqueue, locate
+
+MAX_BATCH_SIZE = 500
+
+
+def collect_product_ids(payloads):
+    """Номера товаров всех заказов, приведённые так же, как их приведёт
+    OrderItemSerializer: "1" и 1 — один и тот же товар.
+    """
+    product_field = OrderItemSerializer().fields["product"]
+    product_ids = set()
+    for payload in payloads:
+        items = payload.get("items") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict) or "product" not in item:
+                continue
+            try:
+                product_ids.add(product_field.to_internal_value(item["product"]))
+            except serializers.ValidationError:
+                continue
+    return product_ids
+
+
+def locate_addresses(addresses):
+    """Ищет координаты каждого адреса один раз, даже если он встречается
+    в нескольких заказах в разном написании.
+
+    Пока координат нет, в очередь геокодера ставится каждое написание:
+    координаты заказам и признак ожидания на доске ищутся по точному
+    адресу. Геокодер при этом вызывается один раз — остальные написания
+    воркер найдёт в кэше по нормализованному адресу.
+    """
+    coordinates_by_key = {}
+    coordinates = {}
+    for address in addresses:
+        key = canonical_address(address)
+        if key not in coordinates_by_key:
+            coordinates_by_key[key] = locate(address)
+        elif coordinates_by_key[key] == (None, None):
+            enqueue(address)
+        coordinates[address] = coordinates_by_key[key]
+    return coordinates
+
+
+def create_orders(payloads):
+    """Проверяет и создаёт пачку заказов в формате OrderSerializer.
+
+    Товары всех заказов загружаются одним запросом, заказы и позиции
+    вставляются двумя bulk_create в одной транзакции. Невалидные заказы
+    не мешают создать остальные. Возвращает список результатов по порядку:
+    {"index", "status": "created", "id"} или {"index", "status": "error", "errors"}.
+    """
+    products = Product.objects.only("id", "name", "price").in_bulk(
+        collect_product_ids(payloads)
+    )
+
+    results = [None] * len(payloads)
+    valid = []
+    for index, payload in enumerate(payloads):
+        serializer = OrderSerializer(data=payload, context={"products": products})
+        if serializer.is_valid():
+            valid.append((index, serializer.build_order(serializer.validated_data)))
+        else:
+            results[index] = {
+                "index": index,
+                "status": "error",
+                "errors": serializer.errors,
+            }
+
+    coordinates = locate_addresses({order.address for _, (order, _) in valid})
+    orders = []
+    for _, (order, _) in valid:
+        order.latitude, order.longitude = coordinates[order.address]
+        orders.append(order)
+
+    with transaction.atomic():
+        Order.objects.bulk_create(orders)
+        order_items = []
+        for _, (order, items) in valid:
+            for order_item in items:
+                order_item.order = order
+                order_items.append(order_item)
+        OrderItem.objects.bulk_create(order_items)
+        OrderEvent.objects.record([order.pk for order in orders], OrderEvent.CREATED)
+
+    for index, (order, _) in valid:
+        results[index] = {"index": index, "status": "created", "id": order.id}
+    return results
@@ -0,0 +1,200 @@
+import statistics
+import time
+import tracemalloc
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from foodcartapp.availability import AVAILABILITY_VERSION
+from foodcartapp.catalogue import CATALOGUE_VERSION
+from foodcartapp.geohash import encode
+from foodcartapp.models import (
+    Order,
+    OrderItem,
+    Product,
+    ProductCategory,
+    Restaurant,
+    RestaurantMenuItem,
+)
+from foodcartapp.versions import bump_version
+from foodcartapp.zones import ZONES_VERSION
+
+# Размеры данных: рестораны, товары, доля меню ресторана из всех товаров,
+# незавершённые заказы и позиций в заказе
+SCALES = {
+    "small": {
+        "restaurants": 5,
+        "products": 20,
+        "menu_share": 0.7,
+        "orders": 50,
+        "items": 3,
+    },
+    "medium": {
+        "restaurants": 50,
+        "products": 200,
+        "menu_share": 0.5,
+        "orders": 1000,
+        "items": 3,
+    },
+    "large": {
+        "restaurants": 200,
+        "products": 500,
+        "menu_share": 0.4,
+        "orders": 5000,
+        "items": 4,
+    },
+}
+
+CATEGORIES = ["Бургеры", "Роллы", "Напитки", "Десерты"]
+ORDER_STATUSES = ["new", "processing", "restaurant", "delivery"]
+
+
+def invalidate_cached_data():
+    """Сбрасывает закэшированные каталог, меню и зоны доставки.
+
+    Данные бенчмарка живут в откатываемой транзакции, и сигналы
+    не успевают поменять версии: без сброса бенчмарк увидит кэш
+    настоящих данных, а после отката — наоборот.
+    """
+    for name in (CATALOGUE_VERSION, AVAILABILITY_VERSION, ZONES_VERSION):
+        bump_version(name)
+
+
+def random_point(rng):
+    """Случайная точка в окрестностях Москвы."""
+    return 55.55 + rng.random() * 0.4, 37.35 + rng.random() * 0.55
+
+
+def seed(scale, rng):
+    """Наполняет базу синтетическими данными в форме data_utf8.json.
+
+    Координаты заполняются сразу, чтобы геокодер не участвовал. Возвращает
+    созданные товары.
+    """
+    categories = ProductCategory.objects.bulk_create(
+        ProductCategory(name=name) for name in CATEGORIES
+    )
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"Товар {number}",
+            category=categories[number % len(categories)],
+            price=Decimal(rng.randrange(99, 600)),
+            image="benchmark.jpg",
+            description="Булочка, котлета, сыр и фирменный соус.",
+        )
+        for number in range(scale["products"])
+    )
+
+    restaurants = []
+    for number in range(scale["restaurants"]):
+        latitude, longitude = random_point(rng)
+        restaurants.append(
+            Restaurant(
+                name=f"Ресторан {number}",
+                address=f"Москва, ул. Бенчмарка, {number + 1}",
+                contact_phone="+7 (900) 000-00-00",
+                latitude=latitude,
+                longitude=longitude,
+                geohash=encode(latitude, longitude),
+            )
+        )
+    restaurants = Restaurant.objects.bulk_create(restaurants)
+
+    menu_size = max(1, int(len(products) * scale["menu_share"]))
+    RestaurantMenuItem.objects.bulk_create(
+        RestaurantMenuItem(restaurant=restaurant, product=product)
+        for restaurant in restaurants
+        for product in rng.sample(products, menu_size)
+    )
+
+    orders = []
+    for number in range(scale["orders"]):
+        latitude, longitude = random_point(rng)
+        orders.append(
+            Order(
+                firstname="Маркел",
+                lastname="Иванов",
+                phonenumber="+79048908292",
+                address=f"Москва, ул. Заказов, {number + 1}",
+                status=rng.choice(ORDER_STATUSES),
+                latitude=latitude,
+                longitude=longitude,
+            )
+        )
+    orders = Order.objects.bulk_create(orders)
+    OrderItem.objects.bulk_create(
+        OrderItem(order=order, product=product, quantity=1, fixed_price=product.price)
+        for order in orders
+        for product in rng.sample(products, min(scale["items"], len(products)))
+    )
+    Order.objects.recalculate_totals()
+    return products
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def measure(request, repeat):
+    """Задержка, число SQL-запросов и пик памяти для вызова request().
+
+    Первый вызов меряется отдельно: он собирает кэши. Память меряется
+    отдельным вызовом, так как tracemalloc замедляет код.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        started_at = time.perf_counter()
+        response = request()
+        cold = time.perf_counter() - started_at
+    if response.status_code >= 400:
+        raise RuntimeError(f"Страница ответила {response.status_code}")
+    cold_queries = len(queries.captured_queries)
+
+    latencies, query_counts = [], []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started_at = time.perf_counter()
+            request()
+            latencies.append(time.perf_counter() - started_at)
+        query_counts.append(len(queries.captured_queries))
+
+    tracemalloc.start()
+    try:
+        request()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "cold_ms": round(cold * 1000, 3),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+        "cold_queries": cold_queries,
+        "queries": statistics.median(query_counts),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def compare_reports(previous, current, threshold):
+    """Строки с ухудшениями: p50 выросла больше чем в threshold раз или
+    запросов к БД стало больше."""
+    regressions = []
+    for scale_name, scale in current["scales"].items():
+        previous_endpoints = previous["scales"].get(scale_name, {}).get("endpoints", {})
+        for endpoint, result in scale["endpoints"].items():
+            before = previous_endpoints.get(endpoint)
+            if before is None:
+                continue
+            if result["p50_ms"] > before["p50_ms"] * threshold:
+                regressions.append(
+                    f"{scale_name} {endpoint}: p50 "
+                    f"{before['p50_ms']} → {result['p50_ms']} мс"
+                )
+            if result["queries"] > before["queries"]:
+                regressions.append(
+                    f"{scale_name} {endpoint}: SQL-запросов "
+                    f"{before['queries']} → {result['queries']}"
+                )
+    return regressions
@@ -0,0 +1,155 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.cache import cache
+
+from foodcartapp.compression import compress_variants, dump_json
+from foodcartapp.models import Product
+from foodcartapp.versions import get_version
+
+CATALOGUE_VERSION = "catalogue"
+
+PAGE_FILTERS = {"category", "restaurant", "special_status"}
+PAGE_PARAMS = PAGE_FILTERS | {"limit", "cursor"}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+ITERATOR_CHUNK_SIZE = 100
+
+
+class CatalogueQueryError(ValueError):
+    pass
+
+
+def serialize_product(product):
+    return {
+        "id": product.id,
+        "name": product.name,
+        "price": product.price,
+        "special_status": product.special_status,
+        "description": product.description,
+        "category": {
+            "id": product.category.id,
+            "name": product.category.name,
+        } if product.category else None,
+        "image": product.image.url,
+        "restaurant": {
+            "id": product.id,
+            "name": product.name,
+        }
+    }
+
+
+def build_catalogue_payload(pretty=False):
+    products = Product.objects.select_related("category").available()
+    return dump_json(
+        [serialize_product(product) for product in products], pretty=pretty
+    ).encode()
+
+
+def get_catalogue_version():
+    return get_version(CATALOGUE_VERSION)
+
+
+def get_catalogue_etag(version, pretty=False):
+    return f"catalogue-{version}-{'pretty' if pretty else 'compact'}"
+
+
+def get_catalogue_variants(version, pretty=False):
+    """Возвращает каталог версии version во всех кодировках.
+
+    Сборка и сжатие выполняются только при промахе кэша.
+    """
+    key = f"catalogue:{version}:{'pretty' if pretty else 'compact'}"
+    variants = cache.get(key)
+    if variants is None:
+        variants = compress_variants(build_catalogue_payload(pretty))
+        cache.set(key, variants, timeout=settings.CATALOGUE_CACHE_TIMEOUT)
+    return variants
+
+
+def encode_cursor(product_id):
+    return base64.urlsafe_b64encode(str(product_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CatalogueQueryError("Некорректный курсор")
+
+
+def parse_int(params, name):
+    try:
+        return int(params[name])
+    except ValueError:
+        raise CatalogueQueryError(f"Параметр {name} должен быть числом")
+
+
+def parse_page_params(params):
+    page = {
+        "limit": DEFAULT_PAGE_SIZE,
+        "after": None,
+        "category": None,
+        "restaurant": None,
+        "special_status": None,
+    }
+    if params.get("limit"):
+        page["limit"] = parse_int(params, "limit")
+        if not 1 <= page["limit"] <= MAX_PAGE_SIZE:
+            raise CatalogueQueryError(f"limit должен быть от 1 до {MAX_PAGE_SIZE}")
+    if params.get("cursor"):
+        page["after"] = decode_cursor(params["cursor"])
+    for name in ["category", "restaurant"]:
+        if params.get(name):
+            page[name] = parse_int(params, name)
+    if params.get("special_status"):
+        value = params["special_status"].lower()
+        if value not in {"1", "0", "true", "false"}:
+            raise CatalogueQueryError("special_status должен быть true или false")
+        page["special_status"] = value in {"1", "true"}
+    return page
+
+
+def get_page_queryset(after=None, category=None, restaurant=None, special_status=None):
+    products = Product.objects.select_related("category")
+    if restaurant is None:
+        products = products.available()
+    else:
+        products = products.available_in(restaurant)
+    if category is not None:
+        products = products.filter(category_id=category)
+    if special_status is not None:
+        products = products.filter(special_status=special_status)
+    if after is not None:
+        products = products.filter(pk__gt=after)
+    return products.order_by("pk")
+
+
+def stream_catalogue_page(page):
+    """Отдаёт страницу каталога по частям: {"results": [...], "next": курсор}.
+
+    Продукты читаются из БД итератором, так что память ограничена размером
+    пачки, а не всей выборкой. Для определения следующей страницы
+    запрашивается на один продукт больше, чем limit.
+    """
+    limit = page["limit"]
+    products = get_page_queryset(
+        after=page["after"],
+        category=page["category"],
+        restaurant=page["restaurant"],
+        special_status=page["special_status"],
+    )[: limit + 1]
+
+    yield b'{"results":['
+    emitted = 0
+    next_cursor = None
+    for product in products.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        if emitted == limit:
+            next_cursor = encode_cursor(last_id)
+            break
+        yield (b"," if emitted else b"") + dump_json(serialize_product(product)).encode()
+        last_id = product.id
+        emitted += 1
+    yield b'],"next":' + dump_json(next_cursor).encode() + b"}"
@@ -0,0 +1,94 @@
+import gzip
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IDENTITY = "identity"
+
+# Порядок задаёт предпочтение, если клиент принимает кодировки с равным q.
+# Brotli — необязательная зависимость: без пакета brotli отдаём только gzip.
+ENCODERS = {}
+if brotli:
+    ENCODERS["br"] = lambda payload: brotli.compress(payload, quality=11)
+ENCODERS["gzip"] = lambda payload: gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def wants_pretty(request):
+    return request.GET.get("pretty", "").lower() in {"1", "true", "yes"}
+
+
+def dump_json(data, pretty=False):
+    if pretty:
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, indent=4)
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def compress_variants(payload):
+    """Готовит payload во всех поддерживаемых кодировках один раз, для хранения в кэше."""
+    variants = {IDENTITY: payload}
+    for encoding, encode in ENCODERS.items():
+        variants[encoding] = encode(payload)
+    return variants
+
+
+def parse_accept_encoding(header):
+    accepted = {}
+    for item in header.split(","):
+        encoding, _, params = item.strip().partition(";")
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[encoding.lower()] = quality
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = parse_accept_encoding(header or "")
+    best, best_quality = IDENTITY, 0.0
+    for encoding in ENCODERS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    if best_quality < accepted.get(IDENTITY, 1.0):
+        return IDENTITY
+    return best
+
+
+def precompressed_response(request, get_variants, etag=None, content_type="application/json"):
+    """Отдаёт заранее сжатый вариант ответа по Accept-Encoding, не сжимая его заново.
+
+    get_variants вызывается, только если нужно тело ответа, и возвращает
+    результат compress_variants. etag — базовый тег без кавычек; к нему
+    добавляется кодировка, так как у разных представлений должны быть
+    разные сильные ETag.
+    """
+    encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+    etag = f'"{etag}-{encoding}"' if etag else None
+    client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag and (etag in client_etags or "*" in client_etags):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(get_variants()[encoding], content_type=content_type)
+        if encoding != IDENTITY:
+            response["Content-Encoding"] = encoding
+    if etag:
+        response["ETag"] = etag
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -0,0 +1,84 @@
+import numpy as np
+
+HAVERSINE = "haversine"
+ELLIPSOIDAL = "ellipsoidal"
+
+EARTH_RADIUS_KM = 6371.0088
+
+WGS84_MAJOR_AXIS_KM = 6378.137
+WGS84_FLATTENING = 1 / 298.257223563
+
+
+def as_points(points):
+    """Превращает список пар (широта, долгота) в массив n×2 в радианах.
+
+    Отсутствующие координаты (None вместо точки или её компоненты)
+    становятся NaN, и расстояния до таких точек тоже будут NaN.
+    """
+    coordinates = [
+        (np.nan, np.nan) if point is None else point for point in points
+    ]
+    array = np.array(coordinates, dtype=float).reshape(-1, 2)
+    return np.radians(array)
+
+
+def central_angle(lat_a, lon_a, lat_b, lon_b):
+    half_dlat = (lat_b - lat_a) / 2
+    half_dlon = (lon_b - lon_a) / 2
+    h = np.sin(half_dlat) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin(half_dlon) ** 2
+    return 2 * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+
+
+def haversine(lat_a, lon_a, lat_b, lon_b):
+    return EARTH_RADIUS_KM * central_angle(lat_a, lon_a, lat_b, lon_b)
+
+
+def ellipsoidal(lat_a, lon_a, lat_b, lon_b):
+    """Формула Ламберта для эллипсоида WGS-84.
+
+    На городских расстояниях расхождение с geopy.distance.geodesic
+    измеряется миллиметрами, поэтому округлённые до 0.1 км значения
+    совпадают с прежними.
+    """
+    f = WGS84_FLATTENING
+    beta_a = np.arctan((1 - f) * np.tan(lat_a))
+    beta_b = np.arctan((1 - f) * np.tan(lat_b))
+    sigma = central_angle(beta_a, lon_a, beta_b, lon_b)
+
+    p = (beta_a + beta_b) / 2
+    q = (beta_b - beta_a) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = (sigma - np.sin(sigma)) * (np.sin(p) * np.cos(q)) ** 2 / np.cos(sigma / 2) ** 2
+        y = (sigma + np.sin(sigma)) * (np.cos(p) * np.sin(q)) ** 2 / np.sin(sigma / 2) ** 2
+    correction = np.where(sigma > 0, x + y, 0)
+    return WGS84_MAJOR_AXIS_KM * (sigma - f / 2 * correction)
+
+
+KERNELS = {
+    HAVERSINE: haversine,
+    ELLIPSOIDAL: ellipsoidal,
+}
+
+
+def distance_matrix(origins, destinations, method=HAVERSINE, decimals=1):
+    """Считает расстояния в км между всеми origins и destinations за один вызов.
+
+    Возвращает массив len(origins)×len(destinations). Там, где у одной из
+    точек нет координат, в матрице NaN. decimals=None отключает округление.
+    """
+    try:
+        kernel = KERNELS[method]
+    except KeyError:
+        raise ValueError(f"Неизвестный способ расчёта расстояния: {method}")
+
+    origins = as_points(origins)
+    destinations = as_points(destinations)
+    distances = kernel(
+        origins[:, 0, np.newaxis],
+        origins[:, 1, np.newaxis],
+        destinations[np.newaxis, :, 0],
+        destinations[np.newaxis, :, 1],
+    )
+    if decimals is not None:
+        distances = np.round(distances, decimals)
+    return distances
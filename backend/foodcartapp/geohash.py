@@ -0,0 +1,89 @@
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Точность хранимого геохэша: ячейка примерно 5×5 м
+PRECISION = 9
+
+KM_PER_DEGREE_LATITUDE = 110.574
+KM_PER_DEGREE_LONGITUDE = 111.320
+
+# Сколько ячеек можно перечислить в одном запросе вокруг точки
+MAX_CELLS = 16
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    """Геохэш точки; пустая строка, если координат нет.
+
+    >>> encode(55.7539, 37.6208, precision=6)
+    'ucfv0j'
+    """
+    if latitude is None or longitude is None:
+        return ""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    value = 0
+    even = True
+    while len(geohash) < precision:
+        coordinate, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        if coordinate >= middle:
+            value = value << 1 | 1
+            bounds[0] = middle
+        else:
+            value <<= 1
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            geohash.append(BASE32[value])
+            bits = value = 0
+    return "".join(geohash)
+
+
+def cell_degrees(precision):
+    """Высота и ширина ячейки геохэша длины precision в градусах."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2**lat_bits, 360 / 2**lon_bits
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """Ячейки геохэша, которые вместе покрывают круг радиусом radius_km.
+
+    Прямоугольник вокруг круга накрывается самыми мелкими ячейками, каких
+    нужно не больше MAX_CELLS. Возвращает None, если круг охватывает
+    полюс или всю долготу и фильтровать по геохэшу нечего.
+    """
+    farthest_latitude = abs(latitude) + radius_km / KM_PER_DEGREE_LATITUDE
+    if farthest_latitude >= 90:
+        return None
+    lat_delta = radius_km / KM_PER_DEGREE_LATITUDE
+    lon_delta = radius_km / (
+        KM_PER_DEGREE_LONGITUDE * math.cos(math.radians(farthest_latitude))
+    )
+    if lon_delta >= 180:
+        return None
+
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_degrees(precision)
+        first_row = math.floor((latitude - lat_delta + 90) / height)
+        last_row = math.floor((latitude + lat_delta + 90) / height)
+        first_column = math.floor((longitude - lon_delta + 180) / width)
+        last_column = math.floor((longitude + lon_delta + 180) / width)
+        rows = last_row - first_row + 1
+        columns = last_column - first_column + 1
+        if rows * columns <= MAX_CELLS:
+            break
+    else:
+        return None
+
+    columns_total = round(360 / width)
+    cells = set()
+    for row in range(first_row, last_row + 1):
+        cell_latitude = -90 + (row + 0.5) * height
+        for column in range(first_column, last_column + 1):
+            cell_longitude = -180 + (column % columns_total + 0.5) * width
+            cells.add(encode(cell_latitude, cell_longitude, precision))
+    return cells
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from foodcartapp.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def hash_request(data):
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def replay(record, request_hash):
+    """Ответ на повтор запроса с уже известным ключом, без повторной обработки."""
+    if record.request_hash != request_hash:
+        return Response(
+            {"error": "Ключ идемпотентности уже использован с другим запросом"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status == IdempotencyKey.PROCESSING:
+        return Response(
+            {"error": "Запрос с этим ключом ещё обрабатывается"},
+            status=status.HTTP_409_CONFLICT,
+            headers={"Retry-After": "1"},
+        )
+    return Response(
+        record.response_body,
+        status=record.response_status,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def take_over(record):
+    """Забирает ключ с зависшей обработкой. Сравнение с прежним locked_at
+    гарантирует, что из одновременных повторов ключ заберёт только один."""
+    now = timezone.now()
+    taken = IdempotencyKey.objects.filter(
+        pk=record.pk, status=IdempotencyKey.PROCESSING, locked_at=record.locked_at
+    ).update(locked_at=now)
+    record.locked_at = now
+    return bool(taken)
+
+
+def resume_or_replay(record, request_hash):
+    """Для уже занятого ключа: (record, None), если прошлая обработка
+    зависла и ключ удалось забрать, иначе (None, ответ для повтора)."""
+    if (
+        record.request_hash == request_hash
+        and record.lease_expired()
+        and take_over(record)
+    ):
+        return record, None
+    return None, replay(record, request_hash)
+
+
+def claim_key(key, request_hash):
+    """Регистрирует ключ за текущим запросом.
+
+    Возвращает (record, None), если ключ свободен, или (None, response)
+    с ответом для повтора. Уникальный индекс по ключу гарантирует, что
+    из одновременных запросов с одним ключом обработку начнёт только один.
+    """
+    IdempotencyKey.objects.expired().filter(key=key).delete()
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                key=key,
+                request_hash=request_hash,
+                expires_at=timezone.now() + settings.IDEMPOTENCY_KEY_TTL,
+            )
+    except IntegrityError:
+        record = IdempotencyKey.objects.filter(key=key).first()
+        if record is None:
+            return claim_key(key, request_hash)
+        return resume_or_replay(record, request_hash)
+    return record, None
+
+
+def idempotent(handler):
+    """Декоратор метода APIView: повтор запроса с тем же Idempotency-Key
+    возвращает сохранённый ответ, не выполняя handler заново.
+    """
+
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return handler(view, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"error": f"{IDEMPOTENCY_HEADER} длиннее {MAX_KEY_LENGTH} символов"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        request_hash = hash_request(request.data)
+        record = IdempotencyKey.objects.filter(
+            key=key, expires_at__gt=timezone.now()
+        ).first()
+        if record:
+            record, response = resume_or_replay(record, request_hash)
+        else:
+            record, response = claim_key(key, request_hash)
+        if response:
+            return response
+
+        try:
+            with transaction.atomic():
+                response = handler(view, request, *args, **kwargs)
+                if response.status_code < 500:
+                    record.status = IdempotencyKey.COMPLETED
+                    record.response_status = response.status_code
+                    record.response_body = response.data
+                    record.save(
+                        update_fields=["status", "response_status", "response_body"]
+                    )
+        except Exception:
+            record.delete()
+            raise
+        if response.status_code >= 500:
+            record.delete()
+        return response
+
+    return wrapper
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from foodcartapp.assignment import assign_orders
+
+
+class Command(BaseCommand):
+    help = "Назначает новым заказам рестораны с учётом расстояния и загрузки"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Пауза в секундах, когда назначать нечего",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Обработать одну пачку и выйти"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            # Вне HTTP-запросов Django сам не проверяет соединение с БД
+            # и не закрывает его по DB_CONN_MAX_AGE
+            close_old_connections()
+            assigned = assign_orders(options["batch_size"])
+            if assigned:
+                self.stdout.write(f"Назначено заказов: {len(assigned)}")
+            if options["once"]:
+                break
+            if len(assigned) < options["batch_size"]:
+                time.sleep(options["interval"])
@@ -0,0 +1,98 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory, override_settings
+
+from foodcartapp.benchmarks import percentile
+
+# (название, CONN_MAX_AGE, CONN_HEALTH_CHECKS)
+MODES = [
+    ("новое соединение на запрос", 0, False),
+    ("постоянные соединения", 600, False),
+    ("постоянные с проверкой", 600, True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает накладные расходы на соединение с БД при разных "
+        "CONN_MAX_AGE и CONN_HEALTH_CHECKS. Запросы проходят через WSGI-обработчик "
+        "Django, как в gunicorn, поэтому соединения закрываются так же, как в бою."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=["/api/products/", "/api/products/?limit=50"],
+            help="Страницы для замера. Без параметров /api/products/ отдаётся "
+            "из кэша, постраничная выдача читает товары из БД",
+        )
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        saved = {
+            key: connection.settings_dict[key]
+            for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS")
+        }
+        connections_opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            connections_opened.append(connection.alias)
+
+        connection_created.connect(count_connection)
+        self.stdout.write(
+            f"{'страница':<26} {'режим':<28} {'мс/запрос':>10} {'p95, мс':>8} "
+            f"{'соединений':>11}"
+        )
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], DEBUG=False
+            ):
+                for path in options["paths"]:
+                    environ = factory.get(path).environ
+                    for name, max_age, health_checks in MODES:
+                        connection.close()
+                        connection.settings_dict["CONN_MAX_AGE"] = max_age
+                        connection.settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+                        connections_opened.clear()
+
+                        latencies = []
+                        for _ in range(options["repeat"]):
+                            started_at = time.perf_counter()
+                            self.get(handler, environ)
+                            latencies.append(time.perf_counter() - started_at)
+
+                        p95 = percentile(latencies, 0.95)
+                        self.stdout.write(
+                            f"{path:<26} {name:<28} "
+                            f"{statistics.mean(latencies) * 1000:>10.3f} "
+                            f"{p95 * 1000:>8.3f} {len(connections_opened):>11}"
+                        )
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.close()
+            connection.settings_dict.update(saved)
+
+    @staticmethod
+    def get(handler, environ):
+        statuses = []
+        response = handler(
+            dict(environ), lambda status, headers: statuses.append(status)
+        )
+        try:
+            for _ in response:
+                pass
+        finally:
+            # Как и WSGI-сервер: close() отправляет request_finished,
+            # по которому Django закрывает устаревшие соединения
+            response.close()
+        if not statuses[0].startswith("200"):
+            raise CommandError(f"{environ['PATH_INFO']} ответила {statuses[0]}")
@@ -0,0 +1,138 @@
+import json
+import platform
+import random
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from foodcartapp.benchmarks import (
+    SCALES,
+    compare_reports,
+    invalidate_cached_data,
+    measure,
+    seed,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Наполняет базу синтетическими данными разного размера и измеряет "
+        "задержку, число SQL-запросов и память основных страниц и API. "
+        "Геокодер подменяется локальной заглушкой, все изменения откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            nargs="+",
+            choices=list(SCALES),
+            default=list(SCALES),
+            help="Размеры данных",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=30, help="Запросов на каждую страницу"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output", default="benchmark-report.json", help="Файл отчёта"
+        )
+        parser.add_argument(
+            "--compare", help="Предыдущий отчёт, с которым сравнить результаты"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.2,
+            help="Во сколько раз может вырасти медиана задержки без предупреждения",
+        )
+
+    def handle(self, *args, **options):
+        previous = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as file:
+                    previous = json.load(file)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Не удалось прочитать {options['compare']}: {e}")
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": options["repeat"],
+            "scales": {},
+        }
+        with override_settings(
+            GEOCODER_BACKEND="geocoder.backends.stub",
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            DEBUG=False,
+        ):
+            for scale_name in options["scales"]:
+                report["scales"][scale_name] = self.run_scale(
+                    SCALES[scale_name], options["repeat"], options["seed"]
+                )
+
+        with open(options["output"], "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(f"Отчёт сохранён в {options['output']}")
+
+        if previous is not None:
+            regressions = compare_reports(previous, report, options["threshold"])
+            for line in regressions:
+                self.stdout.write(self.style.WARNING(line))
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS("Ухудшений нет"))
+
+    def run_scale(self, scale, repeat, seed_value):
+        rng = random.Random(seed_value)
+        try:
+            with transaction.atomic():
+                products = seed(scale, rng)
+                invalidate_cached_data()
+                manager = User.objects.create_user("benchmark-manager", is_staff=True)
+                client = Client()
+                client.force_login(manager)
+
+                order = json.dumps(
+                    {
+                        "firstname": "Маркел",
+                        "lastname": "Иванов",
+                        "phonenumber": "+79048908292",
+                        "address": "Москва, Красная площадь, 1",
+                        "items": [
+                            {"product": product.id, "quantity": 1}
+                            for product in products[: scale["items"]]
+                        ],
+                    }
+                )
+                requests = {
+                    "/api/products/": lambda: client.get("/api/products/"),
+                    "/api/order/": lambda: client.post(
+                        "/api/order/", order, content_type="application/json"
+                    ),
+                    "/manager/orders/": lambda: client.get(
+                        reverse("restaurateur:view_orders")
+                    ),
+                    "/manager/products/": lambda: client.get(
+                        reverse("restaurateur:ProductsView")
+                    ),
+                }
+                endpoints = {}
+                for path, request in requests.items():
+                    endpoints[path] = measure(request, repeat)
+                    self.stdout.write(
+                        f"{scale['orders']:>6} заказов {path:<20} "
+                        f"p50 {endpoints[path]['p50_ms']:>8} мс, "
+                        f"запросов {endpoints[path]['queries']}"
+                    )
+                transaction.set_rollback(True)
+        finally:
+            invalidate_cached_data()
+        return {"sizes": scale, "endpoints": endpoints}
@@ -0,0 +1,74 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from foodcartapp.models import Product
+from foodcartapp.views import OrderCreateView
+
+
+class Command(BaseCommand):
+    help = (
+        "Показывает, сколько SQL-запросов и времени уходит на приём заказа "
+        "в зависимости от числа позиций. Все изменения откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items",
+            type=int,
+            nargs="+",
+            default=[1, 2, 5, 10, 20, 50],
+            help="Размеры заказов, которые нужно измерить",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Заказов на каждый размер"
+        )
+
+    def handle(self, *args, **options):
+        view = OrderCreateView.as_view()
+        factory = RequestFactory()
+
+        with transaction.atomic():
+            products = Product.objects.bulk_create(
+                Product(name=f"Бенчмарк {number}", price=100, image="benchmark.jpg")
+                for number in range(max(options["items"]))
+            )
+
+            self.stdout.write(f"{'позиций':>8} {'запросов':>9} {'мс/заказ':>9}")
+            for items_count in options["items"]:
+                body = json.dumps({
+                    "firstname": "Бенчмарк",
+                    "lastname": "Заказов",
+                    "phonenumber": "+79001234567",
+                    "address": "Москва, Красная площадь, 1",
+                    "items": [
+                        {"product": product.id, "quantity": 1}
+                        for product in products[:items_count]
+                    ],
+                })
+                # Прогрев: первый заказ по адресу ставит его в очередь геокодера
+                self.post_order(view, factory, body)
+
+                started_at = time.perf_counter()
+                with CaptureQueriesContext(connection) as queries:
+                    for _ in range(options["repeat"]):
+                        self.post_order(view, factory, body)
+                elapsed = (time.perf_counter() - started_at) / options["repeat"]
+
+                statements = len(queries.captured_queries) / options["repeat"]
+                self.stdout.write(
+                    f"{items_count:>8} {statements:>9.1f} {elapsed * 1000:>9.2f}"
+                )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def post_order(view, factory, body):
+        request = factory.post("/api/order/", body, content_type="application/json")
+        response = view(request)
+        if response.status_code != 201:
+            raise RuntimeError(f"Заказ не принят: {response.data}")
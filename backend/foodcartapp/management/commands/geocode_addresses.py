@@ -0,0 +1,150 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from foodcartapp import geohash
+from foodcartapp.models import Order, OrderEvent, Restaurant
+from geocoder.bulk import BulkGeocoder
+from geocoder.models import AddressCoordinates, GeocodingTask
+from geocoder.normalize import canonical_address
+
+
+class Command(BaseCommand):
+    help = (
+        "Геокодирует адреса заказов, ресторанов и кэша AddressCoordinates, "
+        "для которых нет координат или они устарели"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Число потоков")
+        parser.add_argument(
+            "--rate", type=float, default=10, help="Запросов к геокодеру в секунду"
+        )
+        parser.add_argument(
+            "--retries", type=int, default=3, help="Повторов при сетевой ошибке"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Сколько результатов записывать в БД за раз",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Показать адреса, которые будут геокодированы, без запросов к API",
+        )
+
+    def handle(self, *args, **options):
+        self.records = self.load_records()
+        self.addresses_by_key = self.collect_addresses()
+        targets = [
+            sorted(addresses)[0]
+            for key, addresses in self.addresses_by_key.items()
+            if key not in self.records or self.records[key].requires_refresh()
+        ]
+        self.stdout.write(f"Адресов для геокодирования: {len(targets)}")
+
+        if options["dry_run"]:
+            for address in targets:
+                self.stdout.write(f"  {address}")
+            return
+
+        geocoder = BulkGeocoder(
+            workers=options["workers"],
+            rate=options["rate"],
+            retries=options["retries"],
+        )
+        results = {}
+        failed = 0
+        for done, (address, result) in enumerate(geocoder.resolve_all(targets), 1):
+            if isinstance(result, Exception):
+                failed += 1
+                self.stderr.write(f"Не удалось геокодировать {address}: {result}")
+            else:
+                results[address] = result
+            if len(results) >= options["batch_size"] or done == len(targets):
+                self.save_results(results)
+                results = {}
+                self.stdout.write(f"Обработано {done}/{len(targets)}, ошибок: {failed}")
+
+        self.stdout.write(self.style.SUCCESS("Готово"))
+
+    def load_records(self):
+        records = {}
+        for record in AddressCoordinates.objects.order_by("updated_at"):
+            records[record.canonical_key] = record
+        return records
+
+    def collect_addresses(self):
+        addresses = set()
+        for model in [Order, Restaurant, AddressCoordinates]:
+            addresses.update(
+                model.objects.exclude(address="")
+                .values_list("address", flat=True)
+                .distinct()
+            )
+        addresses_by_key = defaultdict(set)
+        for address in addresses:
+            key = canonical_address(address)
+            if key:
+                addresses_by_key[key].add(address)
+        return addresses_by_key
+
+    def save_results(self, results):
+        now = timezone.now()
+        records_to_update = []
+        records_to_create = []
+        coordinates_by_address = {}
+
+        for address, coordinates in results.items():
+            latitude, longitude = coordinates or (None, None)
+            key = canonical_address(address)
+            for variant in self.addresses_by_key[key]:
+                coordinates_by_address[variant] = (latitude, longitude)
+
+            record = self.records.get(key)
+            if record is None:
+                records_to_create.append(
+                    AddressCoordinates(
+                        address=address,
+                        canonical_key=key,
+                        latitude=latitude,
+                        longitude=longitude,
+                    )
+                )
+                continue
+            record.latitude = latitude
+            record.longitude = longitude
+            record.updated_at = now
+            records_to_update.append(record)
+
+        with transaction.atomic():
+            AddressCoordinates.objects.bulk_update(
+                records_to_update, ["latitude", "longitude", "updated_at"]
+            )
+            AddressCoordinates.objects.bulk_create(
+                records_to_create, ignore_conflicts=True
+            )
+            for model in [Order, Restaurant]:
+                objects = list(
+                    model.objects.filter(address__in=coordinates_by_address).only(
+                        "id", "address"
+                    )
+                )
+                fields = ["latitude", "longitude"]
+                if model is Restaurant:
+                    fields.append("geohash")
+                for obj in objects:
+                    obj.latitude, obj.longitude = coordinates_by_address[obj.address]
+                    obj.geohash = geohash.encode(obj.latitude, obj.longitude)
+                model.objects.bulk_update(objects, fields)
+            OrderEvent.objects.record(
+                Order.objects.filter(address__in=coordinates_by_address)
+                .exclude(status="completed")
+                .values_list("pk", flat=True),
+                OrderEvent.UPDATED,
+            )
+            GeocodingTask.objects.filter(address__in=coordinates_by_address).delete()
@@ -0,0 +1,224 @@
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from foodcartapp.benchmarks import percentile
+
+ORDER_PATH = "/api/order/"
+BOARD_EVENTS_PATH = "/manager/orders/events/"
+
+
+def get(url):
+    return lambda session: session.get(url, timeout=30)
+
+
+def post_order(url, product_id):
+    payload = {
+        "firstname": "Нагрузка",
+        "lastname": "Тестовая",
+        "phonenumber": "+79001234567",
+        "address": "Москва, Красная площадь, 1",
+        "items": [{"product": product_id, "quantity": 1}],
+    }
+    return lambda session: session.post(url, json=payload, timeout=30)
+
+
+def run_client(session, send, deadline):
+    """Отправляет запросы send(session) до deadline.
+
+    Возвращает (задержки успешных ответов, ошибки).
+    """
+    latencies, errors = [], 0
+    while time.monotonic() < deadline:
+        started_at = time.perf_counter()
+        try:
+            response = send(session)
+            response.raise_for_status()
+        except requests.RequestException:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started_at)
+    return latencies, errors
+
+
+def load(send, concurrency, duration):
+    deadline = time.monotonic() + duration
+
+    def client(_):
+        with requests.Session() as session:
+            return run_client(session, send, deadline)
+
+    started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(client, range(concurrency)))
+    elapsed = time.monotonic() - started_at
+
+    latencies = [
+        latency for client_latencies, _ in results for latency in client_latencies
+    ]
+    errors = sum(client_errors for _, client_errors in results)
+    if not latencies:
+        return {"rps": 0, "errors": errors}
+    return {
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "errors": errors,
+    }
+
+
+def follow_stream(url, cookies, stop):
+    """Держит открытым поток событий доски, как вкладка менеджера."""
+    with requests.Session() as session:
+        while not stop.is_set():
+            try:
+                with session.get(
+                    url, cookies=cookies, stream=True, timeout=(5, 60)
+                ) as response:
+                    response.raise_for_status()
+                    for _ in response.iter_lines():
+                        if stop.is_set():
+                            return
+            except requests.RequestException:
+                stop.wait(1)
+
+
+@contextmanager
+def board_streams(url, count, cookies):
+    """count открытых досок заказов на время блока.
+
+    Потоки событий — долгие запросы, которые занимают sync-воркер целиком,
+    поэтому с ними видно, как конфигурация gunicorn переносит медленный
+    ввод-вывод. Потоки завершаются с ближайшим событием или heartbeat.
+    """
+    stop = threading.Event()
+    for _ in range(count):
+        threading.Thread(
+            target=follow_stream, args=(url, cookies, stop), daemon=True
+        ).start()
+    try:
+        yield
+    finally:
+        stop.set()
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагружает запущенный сервер параллельными клиентами и сохраняет "
+        "пропускную способность и задержки под меткой конфигурации. Запустите "
+        "gunicorn с разными GUNICORN_*, прогоните команду с разными --label "
+        "и одним --output, чтобы сравнить конфигурации в одной таблице. "
+        "Кроме быстрых GET-запросов можно мерить создание заказов (--orders) "
+        "под нагрузкой открытых досок заказов (--board-streams)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=["/api/products/", "/api/products/?limit=50", "/api/banners/"],
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 8, 32],
+            help="Число одновременных клиентов",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Секунд на каждый замер"
+        )
+        parser.add_argument(
+            "--label",
+            required=True,
+            help="Название конфигурации сервера, например gthread-w3-t8. "
+            "Команда не видит настроек сервера, поэтому метку задают вручную",
+        )
+        parser.add_argument(
+            "--orders",
+            action="store_true",
+            help="Добавить сценарий POST /api/order/: создание заказа пишет "
+            "в БД и ставит адрес в очередь геокодера",
+        )
+        parser.add_argument(
+            "--board-streams",
+            type=int,
+            default=0,
+            help="Сколько досок заказов держать открытыми во время замеров",
+        )
+        parser.add_argument(
+            "--sessionid",
+            default=None,
+            help="Cookie sessionid менеджера для --board-streams",
+        )
+        parser.add_argument("--output", default="load-test-report.json")
+
+    def handle(self, *args, **options):
+        url = options["url"]
+        if options["board_streams"] and not options["sessionid"]:
+            raise CommandError("Для --board-streams нужен --sessionid менеджера")
+        try:
+            products = requests.get(url + "/api/products/", timeout=5)
+            products.raise_for_status()
+        except requests.RequestException as e:
+            raise CommandError(f"Сервер {url} недоступен: {e}")
+
+        scenarios = {path: get(url + path) for path in options["paths"]}
+        if options["orders"]:
+            if not products.json():
+                raise CommandError("В каталоге нет товаров для заказа")
+            product_id = products.json()[0]["id"]
+            scenarios[f"POST {ORDER_PATH}"] = post_order(url + ORDER_PATH, product_id)
+        label = options["label"]
+        suffix = ""
+        if options["board_streams"]:
+            suffix = f" +{options['board_streams']} досок"
+
+        results = {}
+        with board_streams(
+            url + BOARD_EVENTS_PATH,
+            options["board_streams"],
+            {"sessionid": options["sessionid"]},
+        ):
+            for name, send in scenarios.items():
+                for concurrency in options["concurrency"]:
+                    result = load(send, concurrency, options["duration"])
+                    scenario = f"{name} x{concurrency}{suffix}"
+                    results[scenario] = result
+                    self.stdout.write(f"{label} {scenario}: {result}")
+
+        report = {}
+        if os.path.exists(options["output"]):
+            with open(options["output"], encoding="utf-8") as file:
+                report = json.load(file)
+        report[label] = results
+        with open(options["output"], "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+        self.print_comparison(report)
+
+    def print_comparison(self, report):
+        labels = list(report)
+        self.stdout.write("\nЗапросов в секунду (p95, мс):")
+        self.stdout.write(f"{'':<44}" + "".join(f"{label:>24}" for label in labels))
+        scenarios = dict.fromkeys(
+            scenario for results in report.values() for scenario in results
+        )
+        for scenario in scenarios:
+            cells = []
+            for label in labels:
+                result = report[label].get(scenario)
+                if result is None or "p95_ms" not in result:
+                    cells.append(f"{'—':>24}")
+                else:
+                    cells.append(f"{result['rps']:>14} ({result['p95_ms']:>6})")
+            self.stdout.write(f"{scenario:<44}" + "".join(cells))
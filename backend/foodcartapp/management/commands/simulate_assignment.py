@@ -0,0 +1,168 @@
+import json
+import statistics
+import time
+from collections import defaultdict, deque
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from foodcartapp.assignment import assign_orders
+from foodcartapp.batch import create_orders
+from foodcartapp.benchmarks import invalidate_cached_data, percentile
+from foodcartapp.models import Order, Restaurant
+from geocoder.backends import stub
+from geocoder.cache import reset_coordinates_cache
+from geocoder.models import AddressCoordinates
+
+
+def load_order_stream(path):
+    """Читает заказы из фикстуры в формате dumpdata (как data_utf8.json)
+    и превращает их в данные для OrderSerializer."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            records = json.load(file)
+    except (OSError, ValueError) as e:
+        raise CommandError(f"Не удалось прочитать {path}: {e}")
+
+    items = defaultdict(list)
+    for record in records:
+        if record["model"] == "foodcartapp.orderitem":
+            fields = record["fields"]
+            items[fields["order"]].append(
+                {"product": fields["product"], "quantity": fields["quantity"]}
+            )
+
+    return [
+        {
+            "firstname": record["fields"]["firstname"],
+            "lastname": record["fields"]["lastname"],
+            "phonenumber": record["fields"]["phonenumber"],
+            "address": record["fields"]["address"],
+            "items": items[record["pk"]],
+        }
+        for record in records
+        if record["model"] == "foodcartapp.order" and items[record["pk"]]
+    ]
+
+
+def fill_coordinates(addresses):
+    """Координаты адресов заказов и ресторанов без координат из локальной
+    заглушки геокодера: очередь геокодирования в симуляции не разбирается.
+    """
+    for address in addresses:
+        coordinates = stub(address)
+        if coordinates:
+            # Не store: у записей, загруженных loaddata, нет нормализованного
+            # адреса, а полный save() его посчитает
+            record = AddressCoordinates.objects.filter(address=address).first()
+            record = record or AddressCoordinates(address=address)
+            record.latitude, record.longitude = coordinates
+            record.save()
+    for restaurant in Restaurant.objects.filter(latitude=None):
+        coordinates = stub(restaurant.address)
+        if coordinates:
+            Restaurant.objects.filter(pk=restaurant.pk).set_coordinates(*coordinates)
+
+
+class Command(BaseCommand):
+    help = (
+        "Проигрывает поток заказов из фикстуры и измеряет, сколько времени "
+        "проходит от приёма заказа до назначения ресторана. "
+        "Координаты адресов берутся из локальной заглушки геокодера. "
+        "Все изменения откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "fixture", help="Файл в формате dumpdata, например data_utf8.json"
+        )
+        parser.add_argument(
+            "--orders", type=int, default=1000, help="Сколько заказов проиграть"
+        )
+        parser.add_argument(
+            "--wave", type=int, default=50, help="Заказов, поступающих между запусками"
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--service-waves",
+            type=int,
+            default=2,
+            help="Через сколько волн назначенный заказ считается выполненным",
+        )
+
+    def handle(self, *args, **options):
+        stream = load_order_stream(options["fixture"])
+        if not stream:
+            raise CommandError("В фикстуре нет заказов с позициями")
+
+        latencies = []
+        batch_timings = []
+        created = {}
+        created_total = assigned_total = 0
+        in_service = deque()
+        reset_coordinates_cache()
+        try:
+            with transaction.atomic():
+                fill_coordinates({payload["address"] for payload in stream})
+                invalidate_cached_data()
+                started_at = time.perf_counter()
+                while created_total < options["orders"]:
+                    wave_size = min(options["wave"], options["orders"] - created_total)
+                    payloads = [
+                        stream[(created_total + number) % len(stream)]
+                        for number in range(wave_size)
+                    ]
+                    if len(in_service) >= options["service_waves"]:
+                        Order.objects.filter(pk__in=in_service.popleft()).update(
+                            status="completed"
+                        )
+                    results = create_orders(payloads)
+                    created_at = time.perf_counter()
+                    accepted = [
+                        result for result in results if result["status"] == "created"
+                    ]
+                    if not accepted:
+                        raise CommandError(
+                            "Ни один заказ волны не принят, например: "
+                            f"{results[0]['errors']}"
+                        )
+                    for result in accepted:
+                        created[result["id"]] = created_at
+                    created_total += len(accepted)
+
+                    in_service.append([])
+                    while True:
+                        batch_started_at = time.perf_counter()
+                        assigned = assign_orders(options["batch_size"])
+                        finished_at = time.perf_counter()
+                        if assigned:
+                            batch_timings.append(finished_at - batch_started_at)
+                            latencies.extend(
+                                finished_at - created.pop(order.id)
+                                for order in assigned
+                            )
+                            assigned_total += len(assigned)
+                            in_service[-1].extend(order.id for order in assigned)
+                        if len(assigned) < options["batch_size"]:
+                            break
+                elapsed = time.perf_counter() - started_at
+
+                transaction.set_rollback(True)
+        finally:
+            invalidate_cached_data()
+            reset_coordinates_cache()
+
+        self.stdout.write(f"Принято заказов: {created_total}")
+        self.stdout.write(f"Назначено ресторанов: {assigned_total}")
+        self.stdout.write(f"Заказов в секунду: {assigned_total / elapsed:.1f}")
+        if latencies:
+            self.stdout.write(
+                "Задержка назначения, мс: "
+                f"p50={percentile(latencies, 0.5) * 1000:.1f} "
+                f"p95={percentile(latencies, 0.95) * 1000:.1f} "
+                f"max={max(latencies) * 1000:.1f}"
+            )
+            self.stdout.write(
+                f"Пачка assign_orders, мс: "
+                f"среднее={statistics.mean(batch_timings) * 1000:.1f}"
+            )
@@ -0,0 +1,84 @@
+from collections import defaultdict
+
+import numpy as np
+
+from foodcartapp.availability import get_availability_matrix
+from foodcartapp.models import OrderItem, Restaurant
+from foodcartapp.distances import ELLIPSOIDAL, distance_matrix
+from foodcartapp.zones import get_zone_index
+
+
+def load_order_products(orders):
+    order_products = defaultdict(set)
+    order_items = OrderItem.objects.filter(
+        order_id__in=[order.id for order in orders]
+    ).values_list("order_id", "product_id")
+    for order_id, product_id in order_items:
+        order_products[order_id].add(product_id)
+    return order_products
+
+
+def match_orders(orders, radius_km=None):
+    """Подбирает рестораны сразу для всех заказов.
+
+    Число запросов к БД не зависит от количества заказов: состав заказов
+    и рестораны загружаются по одному разу, меню берётся из матрицы
+    доступности. Возвращает словарь
+    {order.id: [{"restaurant": ..., "distance": ...}, ...]} с тем же
+    содержимым, что и Order.get_restaurants_with_distances.
+
+    Рестораны, в зоны доставки которых заказ не попадает, отсекаются до
+    расчёта расстояний. Если задан radius_km, рестораны заранее отбираются
+    по геохэшу вокруг заказов, а более далёкие в результат не попадают.
+    """
+    orders = [order for order in orders if order.id]
+    if not orders:
+        return {}
+
+    availability = get_availability_matrix()
+    order_products = load_order_products(orders)
+    points = [(order.latitude, order.longitude) for order in orders]
+    if radius_km is None:
+        restaurants = list(Restaurant.objects.all())
+    else:
+        restaurants = list(Restaurant.objects.around(points, radius_km))
+
+    in_zone = get_zone_index().covers(
+        points, [restaurant.id for restaurant in restaurants]
+    )
+    delivering = in_zone.any(axis=0)
+    restaurants = [
+        restaurant
+        for restaurant, delivers in zip(restaurants, delivering)
+        if delivers
+    ]
+    in_zone = in_zone[:, delivering]
+    restaurant_columns = {
+        restaurant.id: column for column, restaurant in enumerate(restaurants)
+    }
+    distances = distance_matrix(
+        points,
+        [(restaurant.latitude, restaurant.longitude) for restaurant in restaurants],
+        method=ELLIPSOIDAL,
+    )
+
+    matches = {}
+    for row, order in enumerate(orders):
+        restaurant_distances = []
+        restaurant_ids = availability.restaurants_for(
+            order_products.get(order.id, ())
+        )
+        for restaurant_id in restaurant_ids:
+            column = restaurant_columns.get(restaurant_id)
+            if column is None or not in_zone[row, column]:
+                continue
+            distance = distances[row, column]
+            if np.isnan(distance) or (radius_km is not None and distance > radius_km):
+                continue
+            restaurant_distances.append(
+                {"restaurant": restaurants[column], "distance": float(distance)}
+            )
+        matches[order.id] = sorted(
+            restaurant_distances, key=lambda item: item["distance"]
+        )
+    return matches
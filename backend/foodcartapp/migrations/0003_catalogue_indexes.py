@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foodcartapp", "0002_order_total"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "id"], name="foodcartapp_categor_f6c6ed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["special_status", "id"], name="foodcartapp_special_393196_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="restaurantmenuitem",
+            index=models.Index(
+                fields=["availability", "product"],
+                name="foodcartapp_availab_52348f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="restaurantmenuitem",
+            index=models.Index(
+                fields=["restaurant", "availability", "product"],
+                name="foodcartapp_restaur_800177_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:39
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foodcartapp", "0004_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="capacity",
+            field=models.PositiveIntegerField(
+                default=10,
+                help_text="Сколько незавершённых заказов ресторан успевает готовить одновременно",
+                validators=[django.core.validators.MinValueValidator(1)],
+                verbose_name="вместимость",
+            ),
+        ),
+    ]
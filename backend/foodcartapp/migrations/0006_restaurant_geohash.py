@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:41
+
+from django.db import migrations, models
+
+from foodcartapp.geohash import encode
+
+
+def fill_restaurant_geohashes(apps, schema_editor):
+    Restaurant = apps.get_model("foodcartapp", "Restaurant")
+    restaurants = list(
+        Restaurant.objects.exclude(latitude=None).exclude(longitude=None)
+    )
+    for restaurant in restaurants:
+        restaurant.geohash = encode(restaurant.latitude, restaurant.longitude)
+    Restaurant.objects.bulk_update(restaurants, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foodcartapp", "0005_restaurant_capacity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=12,
+                verbose_name="геохэш",
+            ),
+        ),
+        migrations.RunPython(fill_restaurant_geohashes, migrations.RunPython.noop),
+    ]
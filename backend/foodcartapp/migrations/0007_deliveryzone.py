@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+import foodcartapp.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foodcartapp", "0006_restaurant_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeliveryZone",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        blank=True, max_length=50, verbose_name="название"
+                    ),
+                ),
+                (
+                    "polygon",
+                    models.JSONField(
+                        help_text="Вершины многоугольника: [[широта, долгота], ...]",
+                        validators=[foodcartapp.models.validate_polygon],
+                        verbose_name="границы",
+                    ),
+                ),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="delivery_zones",
+                        to="foodcartapp.restaurant",
+                        verbose_name="ресторан",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "зона доставки",
+                "verbose_name_plural": "зоны доставки",
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foodcartapp", "0007_deliveryzone"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderEvent",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "order_id",
+                    models.PositiveIntegerField(
+                        db_index=True, verbose_name="номер заказа"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("created", "Новый заказ"),
+                            ("status", "Смена статуса"),
+                            ("restaurant", "Назначен ресторан"),
+                            ("updated", "Изменение"),
+                            ("deleted", "Удаление"),
+                        ],
+                        max_length=20,
+                        verbose_name="событие",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="время"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "событие заказа",
+                "verbose_name_plural": "события заказов",
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:03
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foodcartapp", "0009_order_status_created_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idempotencykey",
+            name="locked_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, verbose_name="Обработка начата"
+            ),
+        ),
+    ]
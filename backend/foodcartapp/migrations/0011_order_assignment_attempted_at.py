@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foodcartapp", "0010_idempotencykey_locked_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="assignment_attempted_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Последняя попытка назначить ресторан",
+            ),
+        ),
+    ]
@@ -1,13 +1,19 @@
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator
 
-from django.db.models import Count, Sum, F
+from decimal import Decimal
+
+from django.db.models import Count, Sum, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from phonenumber_field.modelfields import PhoneNumberField
 
 from django.core.exceptions import ValidationError
-from geocoder.models import AddressCoordinates
+from django.utils import timezone
+from foodcartapp import geohash
+from foodcartapp.distances import ELLIPSOIDAL, distance_matrix
+from geocoder.tasks import locate
 
-from foodcartapp.utils import calculate_distance, logger
 
 
 def validate_positive(value):
@@ -15,7 +21,143 @@ def validate_positive(value):
         raise ValidationError("Итоговая цена не может быть отрицательной.")
 
 
-class Order(models.Model):
+class ChangeTrackingModel(models.Model):
+    """Запоминает значения полей, загруженные из базы, и при сохранении
+    обновляет только изменённые столбцы.
+
+    Экземпляр, созданный не из базы, сохраняется как обычно.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._remember_loaded_values(fields)
+
+    def _remember_loaded_values(self, fields=None):
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None or fields is None:
+            loaded = self._loaded_values = {}
+        for field in self._meta.concrete_fields:
+            if fields is not None and not {field.name, field.attname} & set(fields):
+                continue
+            if field.attname in self.__dict__:
+                loaded[field.attname] = self.__dict__[field.attname]
+
+    def get_changed_fields(self):
+        """Имена полей, изменённых с момента загрузки, или None, если объект не из базы."""
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None or self._state.adding:
+            return None
+        return {
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (
+                field.attname not in loaded
+                or loaded[field.attname] != self.__dict__[field.attname]
+            )
+        }
+
+    def has_changed(self, field_name):
+        changed_fields = self.get_changed_fields()
+        return changed_fields is None or field_name in changed_fields
+
+    def save(self, *args, **kwargs):
+        changed_fields = self.get_changed_fields()
+        if (
+            changed_fields is not None
+            and kwargs.get("update_fields") is None
+            and not args
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = changed_fields
+        super().save(*args, **kwargs)
+        self._remember_loaded_values()
+
+
+class GeocodedAddressMixin:
+    """Определяет координаты при создании объекта и при смене адреса."""
+
+    def save(self, *args, **kwargs):
+        if self.address and self.has_changed("address"):
+            self.latitude, self.longitude = locate(self.address)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "address" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "latitude", "longitude"}
+        super().save(*args, **kwargs)
+
+
+class GeohashMixin:
+    """Пересчитывает геохэш, когда меняются координаты."""
+
+    def save(self, *args, **kwargs):
+        point_geohash = geohash.encode(self.latitude, self.longitude)
+        if point_geohash != self.geohash:
+            self.geohash = point_geohash
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
+
+class OrderQuerySet(models.QuerySet):
+    def recalculate_totals(self):
+        items_total = (
+            OrderItem.objects.filter(order=OuterRef("pk"))
+            .values("order")
+            .annotate(total=Sum(F("quantity") * F("fixed_price")))
+            .values("total")
+        )
+        return self.update(
+            total=Coalesce(
+                Subquery(items_total, output_field=models.DecimalField()),
+                Value(Decimal(0)),
+            )
+        )
+
+    def add_to_total(self, amount):
+        return self.update(total=F("total") + amount)
+
+    def unassigned(self):
+        return self.filter(status="new", restaurant__isnull=True)
+
+    def ready_for_assignment(self, retry_before):
+        """Неназначенные заказы с координатами: сначала ещё не разобранные,
+        затем те, чья неудачная попытка была раньше retry_before.
+        """
+        return (
+            self.unassigned()
+            .exclude(latitude=None)
+            .filter(
+                Q(assignment_attempted_at=None)
+                | Q(assignment_attempted_at__lt=retry_before)
+            )
+            .order_by(
+                F("assignment_attempted_at").asc(nulls_first=True), "created_at"
+            )
+        )
+
+    def older_than(self, created_at, pk):
+        """Страница после заказа (created_at, pk) при сортировке от новых к старым."""
+        return self.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        ).order_by("-created_at", "-pk")
+
+    def count_by_status(self):
+        return dict(
+            self.order_by().values_list("status").annotate(count=Count("pk"))
+        )
+
+
+class Order(GeocodedAddressMixin, ChangeTrackingModel):
     STATUS_CHOICES = [
         ("new", "Новый"),
         ("processing", "В обработке"),
@@ -23,6 +165,7 @@ class Order(models.Model):
         ("delivery", "У курьера"),
         ("completed", "Завершён"),
     ]
+    OPEN_STATUSES = ["new", "processing", "restaurant", "delivery"]
 
     status = models.CharField(
         "Статус", max_length=20, choices=STATUS_CHOICES, default="new", db_index=True
@@ -64,58 +207,44 @@ class Order(models.Model):
     created_at = models.DateTimeField("Дата создания", auto_now_add=True)
     called_at = models.DateTimeField("Дата звонка", null=True, blank=True)
     delivered_at = models.DateTimeField("Дата доставки", null=True, blank=True)
+    assignment_attempted_at = models.DateTimeField(
+        "Последняя попытка назначить ресторан",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    total = models.DecimalField(
+        "Сумма заказа",
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        editable=False,
+    )
 
-    def total_price(self):
-        return (
-            self.items.aggregate(total=Sum(F("quantity") * F("fixed_price")))["total"]
-            or 0
-        )
+    objects = OrderQuerySet.as_manager()
 
     def get_available_restaurants(self):
-        return (
-            Restaurant.objects.filter(
-                menu_items__product__in=self.items.values("product"),
-                menu_items__availability=True,
-            )
-            .annotate(total_products=Count("menu_items__product", distinct=True))
-            .filter(total_products=self.items.count())
-            .distinct()
-        )
-
-    def get_restaurants_with_distances(self):
-        if not self.latitude or not self.longitude:
-            return []
-        restaurants = []
-        for restaurant in self.get_available_restaurants():
-            if not restaurant.latitude or not restaurant.longitude:
-                continue
-            try:
-                dist = calculate_distance(
-                    (self.latitude, self.longitude),
-                    (restaurant.latitude, restaurant.longitude),
-                )
-                restaurants.append({"restaurant": restaurant, "distance": dist})
-            except Exception as e:
-                logger.error(f"Ошибка расчета расстояния: {str(e)}")
-        return sorted(restaurants, key=lambda x: x["distance"])
+        from foodcartapp.availability import get_availability_matrix
 
-    def save(self, *args, **kwargs):
+        if "items" in getattr(self, "_prefetched_objects_cache", {}):
+            product_ids = {item.product_id for item in self.items.all()}
+        else:
+            product_ids = set(self.items.values_list("product_id", flat=True))
+        restaurant_ids = get_availability_matrix().restaurants_for(product_ids)
+        return Restaurant.objects.filter(pk__in=restaurant_ids)
 
-        if self.address and (not self.pk or self.address != self._get_old_address()):
-            coords, _ = AddressCoordinates.objects.get_or_create(address=self.address)
-            self.latitude = coords.latitude
-            self.longitude = coords.longitude
-        super().save(*args, **kwargs)
+    def get_restaurants_with_distances(self):
+        from foodcartapp.matching import match_orders
 
-    def _get_old_address(self):
-        if self.pk:
-            return Order.objects.get(pk=self.pk).address
-        return None
+        return match_orders([self]).get(self.id, [])
 
     class Meta:
         verbose_name = "заказ"
         verbose_name_plural = "заказы"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at", "id"]),
+        ]
 
     def __str__(self):
         return f'Заказ №{self.id} от {self.created_at.strftime("%d-%m-%Y %H:%M")}'
@@ -148,11 +277,69 @@ class OrderItem(models.Model):
         verbose_name = "элемент заказа"
         verbose_name_plural = "элементы заказа"
 
+    @property
+    def cost(self):
+        return self.quantity * self.fixed_price
+
     def __str__(self):
         return f"{self.product.name} x {self.quantity}"
 
 
-class Restaurant(models.Model):
+class RestaurantQuerySet(models.QuerySet):
+    def with_open_orders(self):
+        return self.annotate(
+            open_orders=Count("orders", filter=Q(orders__status__in=Order.OPEN_STATUSES))
+        )
+
+    def set_coordinates(self, latitude, longitude):
+        return self.update(
+            latitude=latitude,
+            longitude=longitude,
+            geohash=geohash.encode(latitude, longitude),
+        )
+
+    def around(self, points, radius_km):
+        """Рестораны из ячеек геохэша, которые могут оказаться ближе radius_km
+        к одной из точек points. Точное расстояние нужно проверить отдельно.
+        """
+        prefixes = set()
+        for latitude, longitude in points:
+            if latitude is None or longitude is None:
+                continue
+            cells = geohash.covering_cells(latitude, longitude, radius_km)
+            if cells is None:
+                return self.exclude(geohash="")
+            prefixes |= cells
+        if not prefixes:
+            return self.none()
+        query = Q()
+        for prefix in sorted(prefixes):
+            query |= Q(geohash__startswith=prefix)
+        return self.filter(query)
+
+    def nearest(self, latitude, longitude, radius_km, limit=None):
+        """Ближайшие рестораны не дальше radius_km, по возрастанию расстояния.
+
+        Возвращает список {"restaurant": ..., "distance": ...}, как match_orders.
+        """
+        restaurants = list(self.around([(latitude, longitude)], radius_km))
+        distances = distance_matrix(
+            [(latitude, longitude)],
+            [(restaurant.latitude, restaurant.longitude) for restaurant in restaurants],
+            method=ELLIPSOIDAL,
+        )[0]
+        nearest = sorted(
+            (
+                {"restaurant": restaurant, "distance": float(distance)}
+                for restaurant, distance in zip(restaurants, distances)
+                if distance <= radius_km
+            ),
+            key=lambda item: item["distance"],
+        )
+        return nearest[:limit]
+
+
+class Restaurant(GeocodedAddressMixin, GeohashMixin, ChangeTrackingModel):
     name = models.CharField("название", max_length=50)
     address = models.CharField(
         "адрес",
@@ -167,17 +354,18 @@ class Restaurant(models.Model):
 
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(
+        "геохэш", max_length=12, blank=True, db_index=True, editable=False
+    )
 
-    def save(self, *args, **kwargs):
-        from geocoder.models import AddressCoordinates
+    capacity = models.PositiveIntegerField(
+        "вместимость",
+        default=10,
+        validators=[MinValueValidator(1)],
+        help_text="Сколько незавершённых заказов ресторан успевает готовить одновременно",
+    )
 
-        if self.address and (
-            not self.pk or self.address != Restaurant.objects.get(pk=self.pk).address
-        ):
-            coords, _ = AddressCoordinates.objects.get_or_create(address=self.address)
-            self.latitude = coords.latitude
-            self.longitude = coords.longitude
-        super().save(*args, **kwargs)
+    objects = RestaurantQuerySet.as_manager()
 
     class Meta:
         verbose_name = "ресторан"
@@ -205,6 +393,12 @@ class ProductQuerySet(models.QuerySet):
         )
         return self.filter(pk__in=products)
 
+    def available_in(self, restaurant_id):
+        products = RestaurantMenuItem.objects.filter(
+            restaurant_id=restaurant_id, availability=True
+        ).values_list("product")
+        return self.filter(pk__in=products)
+
 
 class Product(models.Model):
     name = models.CharField("название", max_length=50)
@@ -255,6 +449,10 @@ class Product(models.Model):
     class Meta:
         verbose_name = "товар"
         verbose_name_plural = "товары"
+        indexes = [
+            models.Index(fields=["category", "id"]),
+            models.Index(fields=["special_status", "id"]),
+        ]
 
     def __str__(self):
         return self.name
@@ -279,6 +477,137 @@ class RestaurantMenuItem(models.Model):
         verbose_name = "пункт меню ресторана"
         verbose_name_plural = "пункты меню ресторана"
         unique_together = [["restaurant", "product"]]
+        indexes = [
+            models.Index(fields=["availability", "product"]),
+            models.Index(fields=["restaurant", "availability", "product"]),
+        ]
 
     def __str__(self):
         return f"{self.restaurant.name} - {self.product.name}"
+
+
+def validate_polygon(value):
+    if not isinstance(value, list) or len(value) < 3:
+        raise ValidationError("Зона должна быть списком хотя бы из трёх точек.")
+    for point in value:
+        if (
+            not isinstance(point, list)
+            or len(point) != 2
+            or not all(isinstance(coordinate, (int, float)) for coordinate in point)
+            or not -90 <= point[0] <= 90
+            or not -180 <= point[1] <= 180
+        ):
+            raise ValidationError(
+                f"Некорректная точка {point}: нужна пара [широта, долгота]."
+            )
+
+
+class DeliveryZone(models.Model):
+    restaurant = models.ForeignKey(
+        Restaurant,
+        related_name="delivery_zones",
+        verbose_name="ресторан",
+        on_delete=models.CASCADE,
+    )
+    name = models.CharField("название", max_length=50, blank=True)
+    polygon = models.JSONField(
+        "границы",
+        validators=[validate_polygon],
+        help_text="Вершины многоугольника: [[широта, долгота], ...]",
+    )
+
+    class Meta:
+        verbose_name = "зона доставки"
+        verbose_name_plural = "зоны доставки"
+
+    def __str__(self):
+        return self.name or f"Зона доставки {self.restaurant.name}"
+
+
+class OrderEventQuerySet(models.QuerySet):
+    def record(self, order_ids, kind):
+        return self.bulk_create(
+            [OrderEvent(order_id=order_id, kind=kind) for order_id in order_ids]
+        )
+
+    def after(self, event_id):
+        return self.filter(pk__gt=event_id).order_by("pk")
+
+
+class OrderEvent(models.Model):
+    """Журнал изменений заказов для живой доски менеджера.
+
+    Хранит только номер заказа, а не ссылку на него: событие об удалении
+    заказа должно пережить сам заказ.
+    """
+
+    CREATED = "created"
+    STATUS_CHANGED = "status"
+    RESTAURANT_ASSIGNED = "restaurant"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    KIND_CHOICES = [
+        (CREATED, "Новый заказ"),
+        (STATUS_CHANGED, "Смена статуса"),
+        (RESTAURANT_ASSIGNED, "Назначен ресторан"),
+        (UPDATED, "Изменение"),
+        (DELETED, "Удаление"),
+    ]
+
+    order_id = models.PositiveIntegerField("номер заказа", db_index=True)
+    kind = models.CharField("событие", max_length=20, choices=KIND_CHOICES)
+    created_at = models.DateTimeField("время", auto_now_add=True, db_index=True)
+
+    objects = OrderEventQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "событие заказа"
+        verbose_name_plural = "события заказов"
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: заказ №{self.order_id}"
+
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+
+class IdempotencyKey(models.Model):
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    STATUS_CHOICES = [
+        (PROCESSING, "Обрабатывается"),
+        (COMPLETED, "Выполнен"),
+    ]
+
+    key = models.CharField("Ключ", max_length=255, unique=True)
+    request_hash = models.CharField("Хэш запроса", max_length=64)
+    status = models.CharField(
+        "Статус", max_length=20, choices=STATUS_CHOICES, default=PROCESSING
+    )
+    response_status = models.PositiveSmallIntegerField(
+        "HTTP-статус ответа", null=True, blank=True
+    )
+    response_body = models.JSONField("Тело ответа", null=True, blank=True)
+    created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+    locked_at = models.DateTimeField("Обработка начата", default=timezone.now)
+    expires_at = models.DateTimeField("Истекает", db_index=True)
+
+    objects = IdempotencyKeyQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "ключ идемпотентности"
+        verbose_name_plural = "ключи идемпотентности"
+
+    def __str__(self):
+        return self.key
+
+    def lease_expired(self):
+        """Обработка не завершилась за IDEMPOTENCY_PROCESSING_TIMEOUT:
+        воркер, скорее всего, убит, и ключ можно забрать."""
+        return (
+            self.status == self.PROCESSING
+            and self.locked_at
+            <= timezone.now() - settings.IDEMPOTENCY_PROCESSING_TIMEOUT
+        )
@@ -1,13 +1,13 @@
+from django.db import transaction
 from rest_framework import serializers
 from phonenumber_field.serializerfields import PhoneNumberField
 from .models import Order, OrderItem, Product
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
-    product = serializers.PrimaryKeyRelatedField(
-        queryset=Product.objects.all(),
-        error_messages={'does_not_exist': 'Товар с ID {pk_value} не существует'}
-    )
+    # Товары проверяются одним запросом в OrderSerializer.validate_items,
+    # а не по запросу на каждую позицию, как делал бы PrimaryKeyRelatedField
+    product = serializers.IntegerField(min_value=1)
     quantity = serializers.IntegerField(
         min_value=1,
         max_value=20,
@@ -58,21 +58,49 @@ class OrderSerializer(serializers.ModelSerializer):
     def validate_items(self, value):
         if not value:
             raise serializers.ValidationError("Заказ должен содержать хотя бы один товар")
-        return value
 
-    def create(self, validated_data):
-        items_data = validated_data.pop('items')
-        order = Order.objects.create(**validated_data)
+        # Пакетный приём заказов передаёт товары, загруженные заранее для всех заказов
+        products = self.context.get('products')
+        if products is None:
+            products = Product.objects.only('id', 'name', 'price').in_bulk(
+                {item['product'] for item in value}
+            )
+        errors = [
+            {}
+            if item['product'] in products
+            else {'product': [f"Товар с ID {item['product']} не существует"]}
+            for item in value
+        ]
+        if any(errors):
+            raise serializers.ValidationError(errors)
 
+        return [
+            {**item, 'product': products[item['product']]}
+            for item in value
+        ]
+
+    @staticmethod
+    def build_order(validated_data):
+        """Собирает несохранённые заказ и его позиции с зафиксированными ценами."""
+        order_data = dict(validated_data)
         order_items = [
             OrderItem(
-                order=order,
                 product=item_data['product'],
                 quantity=item_data['quantity'],
                 fixed_price=item_data['product'].price
             )
-            for item_data in items_data
+            for item_data in order_data.pop('items')
         ]
-        OrderItem.objects.bulk_create(order_items)
+        total = sum(order_item.cost for order_item in order_items)
+        return Order(total=total, **order_data), order_items
+
+    def create(self, validated_data):
+        order, order_items = self.build_order(validated_data)
+
+        with transaction.atomic():
+            order.save()
+            for order_item in order_items:
+                order_item.order = order
+            OrderItem.objects.bulk_create(order_items)
 
         return order
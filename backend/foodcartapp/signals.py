@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from foodcartapp.availability import AVAILABILITY_VERSION
+from foodcartapp.catalogue import CATALOGUE_VERSION
+from foodcartapp.models import (
+    DeliveryZone,
+    Order,
+    OrderEvent,
+    OrderItem,
+    Product,
+    ProductCategory,
+    Restaurant,
+    RestaurantMenuItem,
+)
+from foodcartapp.versions import bump_version
+from foodcartapp.zones import ZONES_VERSION
+from geocoder.signals import address_geocoded
+
+
+# Сумма заказа меняется через update(), без post_save заказа: событие для
+# доски заказов записывается здесь
+@receiver(post_save, sender=OrderItem)
+def add_item_to_order_total(sender, instance, created, raw=False, **kwargs):
+    orders = Order.objects.filter(pk=instance.order_id)
+    if created and not raw:
+        orders.add_to_total(instance.cost)
+    else:
+        orders.recalculate_totals()
+    if not raw:
+        OrderEvent.objects.record([instance.order_id], OrderEvent.UPDATED)
+
+
+@receiver(post_delete, sender=OrderItem)
+def subtract_item_from_order_total(sender, instance, **kwargs):
+    Order.objects.filter(pk=instance.order_id).add_to_total(-instance.cost)
+    OrderEvent.objects.record([instance.order_id], OrderEvent.UPDATED)
+
+
+@receiver(post_save, sender=Order)
+def log_order_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        kind = OrderEvent.CREATED
+    elif update_fields and "status" in update_fields:
+        kind = OrderEvent.STATUS_CHANGED
+    elif update_fields and "restaurant" in update_fields:
+        kind = OrderEvent.RESTAURANT_ASSIGNED
+    else:
+        kind = OrderEvent.UPDATED
+    OrderEvent.objects.record([instance.pk], kind)
+
+
+@receiver(post_delete, sender=Order)
+def log_order_deleted(sender, instance, **kwargs):
+    OrderEvent.objects.record([instance.pk], OrderEvent.DELETED)
+
+
+@receiver(address_geocoded)
+def fill_coordinates(sender, address, latitude, longitude, **kwargs):
+    orders = Order.objects.filter(address=address)
+    OrderEvent.objects.record(
+        orders.exclude(status="completed").values_list("pk", flat=True),
+        OrderEvent.UPDATED,
+    )
+    orders.update(latitude=latitude, longitude=longitude)
+    Restaurant.objects.filter(address=address).set_coordinates(latitude, longitude)
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductCategory)
+@receiver([post_save, post_delete], sender=RestaurantMenuItem)
+def invalidate_catalogue(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(CATALOGUE_VERSION))
+
+
+@receiver([post_save, post_delete], sender=RestaurantMenuItem)
+def invalidate_availability(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(AVAILABILITY_VERSION))
+
+
+@receiver([post_save, post_delete], sender=DeliveryZone)
+def invalidate_zones(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(ZONES_VERSION))
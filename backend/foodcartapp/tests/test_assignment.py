@@ -0,0 +1,165 @@
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from foodcartapp.assignment import assign_orders
+from foodcartapp.models import (
+    Order,
+    OrderItem,
+    Product,
+    Restaurant,
+    RestaurantMenuItem,
+)
+
+
+class AssignOrdersTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.near = self.create_restaurant("Рядом", 55.75, capacity=2)
+        self.far = self.create_restaurant("Далеко", 55.80, capacity=10)
+
+    def create_restaurant(self, name, lat, capacity):
+        restaurant = Restaurant.objects.create(
+            name=name, capacity=capacity, latitude=lat, longitude=37.62
+        )
+        RestaurantMenuItem.objects.create(restaurant=restaurant, product=self.burger)
+        return restaurant
+
+    def create_order(self, lat=55.74, status="new", restaurant=None, product=None):
+        order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="Москва, Красная площадь, 1",
+            status=status,
+            restaurant=restaurant,
+        )
+        OrderItem.objects.create(
+            order=order, product=product or self.burger, fixed_price=100
+        )
+        Order.objects.filter(pk=order.pk).update(latitude=lat, longitude=37.62)
+        return order
+
+    def assigned_restaurants(self, orders):
+        restaurants = dict(
+            Order.objects.filter(pk__in=[order.pk for order in orders]).values_list(
+                "pk", "restaurant"
+            )
+        )
+        return [restaurants[order.pk] for order in orders]
+
+    def test_nearest_restaurant_until_it_is_loaded(self):
+        """Ближайший ресторан получает заказы, пока не заполнится"""
+        orders = [self.create_order() for _ in range(4)]
+
+        assigned = assign_orders()
+
+        self.assertEqual(len(assigned), 4)
+        self.assertEqual(
+            self.assigned_restaurants(orders),
+            [self.near.pk, self.near.pk, self.far.pk, self.far.pk],
+        )
+
+    def test_open_orders_count_as_load(self):
+        self.create_order(status="processing", restaurant=self.near)
+        self.create_order(status="delivery", restaurant=self.near)
+        self.create_order(status="completed", restaurant=self.far)
+        order = self.create_order()
+
+        assign_orders()
+
+        self.assertEqual(self.assigned_restaurants([order]), [self.far.pk])
+        self.assertEqual(
+            dict(Restaurant.objects.with_open_orders().values_list("pk", "open_orders")),
+            {self.near.pk: 2, self.far.pk: 1},
+        )
+
+    def test_skips_orders_without_coordinates(self):
+        order = self.create_order(lat=None)
+
+        self.assertEqual(assign_orders(), [])
+        self.assertEqual(self.assigned_restaurants([order]), [None])
+
+    def test_unassignable_orders_do_not_block_new_ones(self):
+        """Заказы, которые никто не может приготовить, не занимают пачку"""
+        nobody_sells = Product.objects.create(name="Пицца", price=300, image="p.jpg")
+        stuck = [self.create_order(product=nobody_sells) for _ in range(3)]
+        order = self.create_order()
+
+        self.assertEqual(assign_orders(batch_size=3), [])
+        self.assertEqual(assign_orders(batch_size=3), [order])
+
+        Order.objects.filter(pk__in=[order.pk for order in stuck]).update(
+            assignment_attempted_at=timezone.now() - timedelta(hours=1)
+        )
+        RestaurantMenuItem.objects.create(restaurant=self.far, product=nobody_sells)
+        cache.clear()
+        self.assertEqual(len(assign_orders(batch_size=3)), 3)
+
+    def test_command_processes_batches(self):
+        orders = [self.create_order() for _ in range(3)]
+        stdout = StringIO()
+
+        call_command("assign_orders", "--once", "--batch-size", "2", stdout=stdout)
+
+        self.assertEqual(
+            self.assigned_restaurants(orders), [self.near.pk, self.near.pk, None]
+        )
+        self.assertIn("Назначено заказов: 2", stdout.getvalue())
+
+
+class SimulateAssignmentTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        restaurant = Restaurant.objects.create(
+            name="Бургерная", address="Москва, Тверская улица, 9"
+        )
+        RestaurantMenuItem.objects.create(restaurant=restaurant, product=self.burger)
+
+    def simulate(self, product_id, orders=4):
+        records = [
+            {
+                "model": "foodcartapp.order",
+                "pk": 1,
+                "fields": {
+                    "firstname": "Иван",
+                    "lastname": "Иванов",
+                    "phonenumber": "+79001234567",
+                    "address": "Москва, Тверская улица, 7",
+                },
+            },
+            {
+                "model": "foodcartapp.orderitem",
+                "pk": 1,
+                "fields": {"order": 1, "product": product_id, "quantity": 1},
+            },
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as fixture:
+            json.dump(records, fixture)
+            fixture.flush()
+            stdout = StringIO()
+            call_command(
+                "simulate_assignment", fixture.name, "--orders", orders, stdout=stdout
+            )
+        return stdout.getvalue()
+
+    def test_replayed_orders_are_geocoded_and_assigned(self):
+        output = self.simulate(self.burger.pk)
+
+        self.assertIn("Назначено ресторанов: 4", output)
+        self.assertFalse(Order.objects.exists())
+        self.assertIsNone(Restaurant.objects.get().latitude)
+
+    def test_fails_when_no_order_is_accepted(self):
+        with self.assertRaises(CommandError):
+            self.simulate(self.burger.pk + 1)
@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from foodcartapp.availability import (
+    AVAILABILITY_VERSION,
+    AvailabilityMatrix,
+    get_availability_matrix,
+)
+from foodcartapp.models import (
+    Order,
+    OrderItem,
+    Product,
+    Restaurant,
+    RestaurantMenuItem,
+)
+from foodcartapp.versions import bump_version, get_version
+
+
+class AvailabilityMatrixTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.matrix = AvailabilityMatrix([(1, 10), (1, 20), (2, 20), (3, 30)])
+
+    def test_restaurants_for_products(self):
+        self.assertEqual(self.matrix.restaurants_for([1]), {10, 20})
+        self.assertEqual(self.matrix.restaurants_for([1, 2]), {20})
+        self.assertEqual(self.matrix.restaurants_for([1, 3]), set())
+        self.assertEqual(self.matrix.restaurants_for([1, 4]), set())
+        self.assertEqual(self.matrix.restaurants_for([]), set())
+
+    def test_row_follows_requested_order(self):
+        self.assertEqual(self.matrix.row(1, [30, 20, 10, 40]), [False, True, True, False])
+        self.assertEqual(self.matrix.row(4, [10]), [False])
+        self.assertTrue(self.matrix.is_available(2, 20))
+        self.assertFalse(self.matrix.is_available(2, 10))
+
+
+class AvailabilityCacheTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.restaurant = Restaurant.objects.create(name="Бургерная")
+
+    def test_menu_changes_refresh_matrix(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            item = RestaurantMenuItem.objects.create(
+                restaurant=self.restaurant, product=self.burger
+            )
+        self.assertTrue(
+            get_availability_matrix().is_available(self.burger.id, self.restaurant.id)
+        )
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_availability_matrix(), get_availability_matrix())
+
+        item.availability = False
+        with self.captureOnCommitCallbacks(execute=True):
+            item.save()
+        self.assertEqual(get_availability_matrix().restaurants_for([self.burger.id]), set())
+
+    def test_matrix_is_shared_between_processes(self):
+        """Другой процесс получает новую матрицу по версии из общего кэша"""
+        stale = get_availability_matrix()
+        RestaurantMenuItem.objects.create(restaurant=self.restaurant, product=self.burger)
+        bump_version(AVAILABILITY_VERSION)
+
+        fresh = get_availability_matrix()
+
+        self.assertIsNot(fresh, stale)
+        self.assertEqual(fresh.restaurants_for([self.burger.id]), {self.restaurant.id})
+
+    def test_bumps_do_not_read_previous_version(self):
+        """Версия не увеличивается через incr, а заменяется новой меткой:
+        одновременные изменения не могут вернуть старую версию"""
+        versions = {get_version(AVAILABILITY_VERSION)}
+        with patch.object(cache, "incr", side_effect=AssertionError):
+            for _ in range(3):
+                versions.add(bump_version(AVAILABILITY_VERSION))
+
+        self.assertEqual(len(versions), 4)
+        self.assertIn(get_version(AVAILABILITY_VERSION), versions)
+
+    def test_order_available_restaurants(self):
+        RestaurantMenuItem.objects.create(restaurant=self.restaurant, product=self.burger)
+        order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="Москва, Красная площадь, 1",
+        )
+        OrderItem.objects.create(order=order, product=self.burger, fixed_price=100)
+        get_availability_matrix()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(list(order.get_available_restaurants()), [self.restaurant])
+
+    def test_products_page(self):
+        other = Restaurant.objects.create(name="Академия бургеров")
+        RestaurantMenuItem.objects.create(restaurant=self.restaurant, product=self.burger)
+        manager = User.objects.create_user("manager", password="secret", is_staff=True)
+        self.client.force_login(manager)
+
+        response = self.client.get(reverse("restaurateur:ProductsView"))
+
+        self.assertEqual(list(response.context["restaurants"]), [other, self.restaurant])
+        self.assertEqual(
+            response.context["products_with_restaurant_availability"],
+            [(self.burger, [False, True])],
+        )
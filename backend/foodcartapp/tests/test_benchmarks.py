@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from foodcartapp.benchmarks import compare_reports
+from foodcartapp.models import Order, Product
+
+
+class BenchmarkEndpointsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_report_and_rollback(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "report.json")
+            call_command(
+                "benchmark_endpoints",
+                "--scales=small",
+                "--repeat=2",
+                f"--output={output}",
+                stdout=StringIO(),
+            )
+            with open(output, encoding="utf-8") as file:
+                report = json.load(file)
+
+        endpoints = report["scales"]["small"]["endpoints"]
+        self.assertEqual(
+            set(endpoints),
+            {"/api/products/", "/api/order/", "/manager/orders/", "/manager/products/"},
+        )
+        self.assertGreater(endpoints["/manager/orders/"]["queries"], 0)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(Product.objects.exists())
+
+    def test_compare_reports(self):
+        def report(p50_ms, queries):
+            endpoint = {"p50_ms": p50_ms, "queries": queries}
+            return {"scales": {"small": {"endpoints": {"/api/order/": endpoint}}}}
+
+        self.assertEqual(compare_reports(report(10, 5), report(11, 5), 1.2), [])
+        self.assertEqual(len(compare_reports(report(10, 5), report(15, 6), 1.2)), 2)
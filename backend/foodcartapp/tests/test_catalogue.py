@@ -0,0 +1,77 @@
+import gzip
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from foodcartapp.models import Product, ProductCategory, Restaurant, RestaurantMenuItem
+
+
+class ProductListApiTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        category = ProductCategory.objects.create(name="Бургеры")
+        self.burger = Product.objects.create(
+            name="Бургер", price=100, image="b.jpg", category=category
+        )
+        restaurant = Restaurant.objects.create(name="Бургерная")
+        RestaurantMenuItem.objects.create(restaurant=restaurant, product=self.burger)
+
+    def test_returns_available_products(self):
+        response = self.client.get("/api/products/")
+
+        self.assertEqual(response.status_code, 200)
+        products = json.loads(response.content)
+        self.assertEqual([product["name"] for product in products], ["Бургер"])
+        self.assertEqual(products[0]["category"]["name"], "Бургеры")
+        self.assertTrue(response["ETag"].startswith('"'))
+
+    def test_cached_payload_and_not_modified(self):
+        """Повторный запрос и ответ 304 не обращаются к БД"""
+        etag = self.client.get("/api/products/")["ETag"]
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/products/").status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_product_change_bumps_version(self):
+        etag = self.client.get("/api/products/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.burger.name = "Чизбургер"
+            self.burger.save()
+
+        response = self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(json.loads(response.content)[0]["name"], "Чизбургер")
+
+    def test_compact_by_default_and_pretty_on_request(self):
+        compact = self.client.get("/api/products/")
+        pretty = self.client.get("/api/products/", {"pretty": "1"})
+
+        self.assertNotIn(b"\n", compact.content)
+        self.assertIn(b"\n    ", pretty.content)
+        self.assertEqual(json.loads(compact.content), json.loads(pretty.content))
+        self.assertNotEqual(compact["ETag"], pretty["ETag"])
+
+    def test_precompressed_gzip(self):
+        plain = self.client.get("/api/products/")
+        compressed = self.client.get("/api/products/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotEqual(compressed["ETag"], plain["ETag"])
+
+    def test_banners(self):
+        response = self.client.get(
+            "/api/banners/", HTTP_ACCEPT_ENCODING="gzip;q=0.5, identity"
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(json.loads(response.content)), 3)
@@ -0,0 +1,61 @@
+import json
+
+from django.test import TestCase
+
+from foodcartapp.models import Product, ProductCategory, Restaurant, RestaurantMenuItem
+
+
+class ProductPageApiTestCase(TestCase):
+
+    def setUp(self):
+        self.burgers = ProductCategory.objects.create(name="Бургеры")
+        self.drinks = ProductCategory.objects.create(name="Напитки")
+        self.first = Restaurant.objects.create(name="Первый")
+        self.second = Restaurant.objects.create(name="Второй")
+        self.products = []
+        for number in range(5):
+            product = Product.objects.create(
+                name=f"Бургер {number}",
+                price=100,
+                image="b.jpg",
+                category=self.burgers,
+                special_status=number == 0,
+            )
+            RestaurantMenuItem.objects.create(restaurant=self.first, product=product)
+            self.products.append(product)
+        self.cola = Product.objects.create(
+            name="Кола", price=50, image="c.jpg", category=self.drinks
+        )
+        RestaurantMenuItem.objects.create(restaurant=self.second, product=self.cola)
+        Product.objects.create(name="Снят с продажи", price=10, image="x.jpg")
+
+    def get_page(self, **params):
+        response = self.client.get("/api/products/", params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_walk_pages_with_cursor(self):
+        names = []
+        page = self.get_page(limit=4)
+        names += [product["name"] for product in page["results"]]
+        self.assertIsNotNone(page["next"])
+
+        page = self.get_page(limit=4, cursor=page["next"])
+        names += [product["name"] for product in page["results"]]
+
+        self.assertIsNone(page["next"])
+        self.assertEqual(names, [product.name for product in self.products] + ["Кола"])
+
+    def test_filters(self):
+        by_category = self.get_page(category=self.drinks.id)
+        by_restaurant = self.get_page(restaurant=self.second.id)
+        special = self.get_page(special_status="true")
+
+        self.assertEqual([p["name"] for p in by_category["results"]], ["Кола"])
+        self.assertEqual([p["name"] for p in by_restaurant["results"]], ["Кола"])
+        self.assertEqual([p["name"] for p in special["results"]], ["Бургер 0"])
+
+    def test_invalid_params(self):
+        for params in [{"cursor": "???"}, {"limit": 0}, {"category": "бургеры"}]:
+            response = self.client.get("/api/products/", params)
+            self.assertEqual(response.status_code, 400)
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from foodcartapp.models import Order, OrderItem, Product, Restaurant
+from geocoder import cache as geocoder_cache
+
+ADDRESS = "Москва, Красная площадь, 1"
+
+
+class ChangeTrackingTestCase(TestCase):
+
+    def setUp(self):
+        geocoder_cache.reset_coordinates_cache()
+        Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address=ADDRESS,
+        )
+        self.order = Order.objects.get()
+
+    def test_status_change_is_one_narrow_update(self):
+        self.order.status = "processing"
+
+        with CaptureQueriesContext(connection) as queries:
+            self.order.save()
+
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        sql = updates[0]
+        self.assertIn('"status"', sql)
+        self.assertNotIn('"address"', sql)
+        self.assertEqual(Order.objects.get().status, "processing")
+
+    def test_unchanged_object_is_not_written(self):
+        with self.assertNumQueries(0):
+            self.order.save()
+
+    @patch("foodcartapp.models.locate", return_value=(55.7, 37.6))
+    def test_address_change_is_geocoded(self, mock_locate):
+        self.order.comment = "Домофон не работает"
+        self.order.save()
+        mock_locate.assert_not_called()
+
+        self.order.address = "Москва, Тверская улица, 1"
+        self.order.save()
+
+        mock_locate.assert_called_once_with("Москва, Тверская улица, 1")
+        self.assertEqual(
+            Order.objects.values_list("latitude", "longitude").get(), (55.7, 37.6)
+        )
+
+    def test_stale_instance_keeps_total(self):
+        """Сохранение не затирает сумму, пересчитанную сигналами в базе"""
+        product = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        OrderItem.objects.create(
+            order=self.order, product=product, quantity=2, fixed_price=100
+        )
+
+        self.order.status = "processing"
+        self.order.save()
+
+        self.assertEqual(Order.objects.get().total, 200)
+
+    @patch("foodcartapp.models.locate", return_value=(55.7, 37.6))
+    def test_restaurant_address_change(self, mock_locate):
+        Restaurant.objects.create(name="Бургерная", address=ADDRESS)
+        restaurant = Restaurant.objects.get()
+        mock_locate.reset_mock()
+
+        restaurant.name = "Бургерная №1"
+        with self.assertNumQueries(1):
+            restaurant.save()
+        mock_locate.assert_not_called()
+
+        restaurant.address = "Москва, Тверская улица, 1"
+        restaurant.save(update_fields=["address"])
+
+        mock_locate.assert_called_once()
+        self.assertEqual(Restaurant.objects.get().latitude, 55.7)
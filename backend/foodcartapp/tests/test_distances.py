@@ -0,0 +1,51 @@
+import math
+
+from django.test import SimpleTestCase
+from geopy import distance
+
+from foodcartapp.distances import ELLIPSOIDAL, HAVERSINE, distance_matrix
+
+
+class DistanceMatrixTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.orders = [
+            (55.753930, 37.620795),
+            (55.729373, 37.603764),
+            (55.812511, 37.498337),
+        ]
+        self.restaurants = [
+            (55.752544, 37.592131),
+            (55.661539, 37.478428),
+            (55.857308, 37.632891),
+            (55.753930, 37.620795),
+        ]
+
+    def test_ellipsoidal_matches_geodesic(self):
+        """Округлённые расстояния совпадают с geopy.distance.geodesic"""
+        matrix = distance_matrix(self.orders, self.restaurants, method=ELLIPSOIDAL)
+
+        self.assertEqual(matrix.shape, (3, 4))
+        for row, order in enumerate(self.orders):
+            for column, restaurant in enumerate(self.restaurants):
+                expected = round(distance.distance(order, restaurant).km, 1)
+                self.assertEqual(matrix[row, column], expected)
+
+    def test_haversine_close_to_geodesic(self):
+        matrix = distance_matrix(
+            self.orders, self.restaurants, method=HAVERSINE, decimals=None
+        )
+
+        for row, order in enumerate(self.orders):
+            for column, restaurant in enumerate(self.restaurants):
+                expected = distance.distance(order, restaurant).km
+                self.assertAlmostEqual(matrix[row, column], expected, delta=expected * 0.005)
+
+    def test_missing_coordinates_give_nan(self):
+        matrix = distance_matrix([None, (None, None)], self.restaurants)
+
+        self.assertTrue(all(math.isnan(value) for value in matrix.flat))
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            distance_matrix(self.orders, self.restaurants, method="manhattan")
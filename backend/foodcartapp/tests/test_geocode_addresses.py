@@ -0,0 +1,60 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from foodcartapp.models import Order, Restaurant
+from geocoder.backends import stub
+from geocoder.models import AddressCoordinates, GeocodingTask
+
+
+@override_settings(GEOCODER_BACKEND="geocoder.backends.stub")
+class GeocodeAddressesCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="ул. Партизана Железняка, 34а",
+        )
+        self.restaurant = Restaurant.objects.create(
+            name="Бургерная", address="Москва, ул. Новый Арбат, 55"
+        )
+
+    def test_fills_missing_coordinates(self):
+        call_command("geocode_addresses", "--rate=1000", stdout=StringIO())
+
+        self.order.refresh_from_db()
+        self.restaurant.refresh_from_db()
+        self.assertEqual(
+            (self.order.latitude, self.order.longitude), stub(self.order.address)
+        )
+        self.assertIsNotNone(self.restaurant.latitude)
+        self.assertEqual(AddressCoordinates.objects.count(), 2)
+        self.assertFalse(GeocodingTask.objects.exists())
+
+    @patch("geocoder.bulk.geocode", side_effect=stub)
+    def test_variants_geocoded_once(self, mock_geocode):
+        Order.objects.create(
+            firstname="Пётр",
+            lastname="Петров",
+            phonenumber="+79001234568",
+            address="улица партизана железняка 34А",
+        )
+
+        call_command("geocode_addresses", "--rate=1000", stdout=StringIO())
+
+        self.assertEqual(mock_geocode.call_count, 2)
+        self.assertFalse(Order.objects.filter(latitude__isnull=True).exists())
+
+    @patch("geocoder.bulk.geocode")
+    def test_dry_run(self, mock_geocode):
+        stdout = StringIO()
+
+        call_command("geocode_addresses", "--dry-run", stdout=stdout)
+
+        mock_geocode.assert_not_called()
+        self.assertIn("Адресов для геокодирования: 2", stdout.getvalue())
+        self.assertFalse(AddressCoordinates.objects.exists())
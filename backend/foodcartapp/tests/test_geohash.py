@@ -0,0 +1,120 @@
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from foodcartapp import geohash
+from foodcartapp.distances import ELLIPSOIDAL, distance_matrix
+from foodcartapp.matching import match_orders
+from foodcartapp.models import Order, OrderItem, Product, Restaurant, RestaurantMenuItem
+from geocoder.models import AddressCoordinates
+from geocoder.tasks import notify_geocoded
+
+
+class GeohashTestCase(SimpleTestCase):
+
+    def test_encode(self):
+        self.assertEqual(
+            geohash.encode(57.64911, 10.40744, precision=11), "u4pruydqqvj"
+        )
+        self.assertEqual(geohash.encode(None, 37.6), "")
+
+    def test_covering_cells_contain_every_point_in_radius(self):
+        rng = random.Random(0)
+        for center in [(55.75, 37.62), (0.0, 179.99), (-33.9, 18.4), (69.0, -0.001)]:
+            for radius in [0.5, 5, 30, 200]:
+                cells = geohash.covering_cells(*center, radius)
+                points = [
+                    (
+                        center[0] + rng.uniform(-1, 1) * radius / 110,
+                        (center[1] + rng.uniform(-1, 1) * radius / 30 + 180) % 360
+                        - 180,
+                    )
+                    for _ in range(200)
+                ]
+                distances = distance_matrix([center], points, method=ELLIPSOIDAL)[0]
+                for point, distance in zip(points, distances):
+                    if distance <= radius:
+                        self.assertTrue(
+                            any(
+                                geohash.encode(*point).startswith(cell)
+                                for cell in cells
+                            ),
+                            f"{point} в {distance} км от {center} вне ячеек {cells}",
+                        )
+
+    def test_huge_radius_is_not_filtered(self):
+        self.assertIsNone(geohash.covering_cells(55.75, 37.62, 10000))
+
+
+class NearestRestaurantsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.kremlin = Restaurant.objects.create(
+            name="Кремль", latitude=55.752, longitude=37.617
+        )
+        self.arbat = Restaurant.objects.create(
+            name="Арбат", latitude=55.752, longitude=37.587
+        )
+        self.kaluga = Restaurant.objects.create(
+            name="Калуга", latitude=54.513, longitude=36.261
+        )
+
+    def test_geohash_follows_coordinates(self):
+        self.assertEqual(self.kremlin.geohash, geohash.encode(55.752, 37.617))
+
+        self.kremlin.latitude = 55.8
+        self.kremlin.save(update_fields=["latitude"])
+
+        self.assertEqual(
+            Restaurant.objects.get(pk=self.kremlin.pk).geohash,
+            geohash.encode(55.8, 37.617),
+        )
+
+    def test_geocoded_restaurant_gets_geohash(self):
+        restaurant = Restaurant.objects.create(
+            name="Цветной", address="Цветной бульвар, 11"
+        )
+        AddressCoordinates.objects.create(
+            address=restaurant.address, latitude=55.771, longitude=37.620
+        )
+
+        notify_geocoded(restaurant.address, (55.771, 37.620))
+
+        restaurant.refresh_from_db()
+        self.assertEqual(restaurant.geohash, geohash.encode(55.771, 37.620))
+
+    def test_nearest_within_radius(self):
+        nearest = Restaurant.objects.nearest(55.754, 37.62, radius_km=30)
+
+        self.assertEqual(
+            [item["restaurant"] for item in nearest], [self.kremlin, self.arbat]
+        )
+        self.assertEqual(
+            Restaurant.objects.nearest(55.754, 37.62, radius_km=30, limit=1)[0][
+                "restaurant"
+            ],
+            self.kremlin,
+        )
+        self.assertNotIn(self.kaluga, Restaurant.objects.around([(55.754, 37.62)], 30))
+
+    def test_match_orders_with_radius(self):
+        burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        for restaurant in [self.kremlin, self.kaluga]:
+            RestaurantMenuItem.objects.create(restaurant=restaurant, product=burger)
+        order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="Москва, Красная площадь, 1",
+        )
+        OrderItem.objects.create(order=order, product=burger, fixed_price=100)
+        Order.objects.filter(pk=order.pk).update(latitude=55.754, longitude=37.62)
+        order.refresh_from_db()
+
+        everywhere = match_orders([order])[order.id]
+        nearby = match_orders([order], radius_km=30)[order.id]
+
+        self.assertEqual(len(everywhere), 2)
+        self.assertEqual([item["restaurant"] for item in nearby], [self.kremlin])
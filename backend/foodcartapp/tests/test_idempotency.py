@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from foodcartapp.idempotency import hash_request
+from foodcartapp.models import IdempotencyKey, Order, Product
+from geocoder import cache as geocoder_cache
+
+
+class IdempotencyKeyTestCase(TestCase):
+
+    def setUp(self):
+        geocoder_cache.reset_coordinates_cache()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.payload = {
+            "firstname": "Иван",
+            "lastname": "Иванов",
+            "phonenumber": "+79001234567",
+            "address": "Москва, Красная площадь, 1",
+            "items": [{"product": self.burger.id, "quantity": 1}],
+        }
+
+    def post_order(self, payload, key="order-1"):
+        return self.client.post(
+            "/api/order/",
+            payload,
+            content_type="application/json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_replay_returns_original_response(self):
+        """Повтор запроса с тем же ключом не создаёт второй заказ"""
+        first = self.post_order(self.payload)
+
+        with self.assertNumQueries(1):
+            second = self.post_order(self.payload)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_reused_with_other_payload(self):
+        self.post_order(self.payload)
+
+        response = self.post_order({**self.payload, "firstname": "Пётр"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_request_in_progress(self):
+        IdempotencyKey.objects.create(
+            key="order-1",
+            request_hash=hash_request(self.payload),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        response = self.post_order(self.payload)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Order.objects.exists())
+
+    def test_abandoned_processing_key_is_taken_over(self):
+        """Ключ убитого воркера не блокирует повторы до конца TTL"""
+        IdempotencyKey.objects.create(
+            key="order-1",
+            request_hash=hash_request(self.payload),
+            locked_at=timezone.now() - timedelta(minutes=5),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        response = self.post_order(self.payload)
+        replayed = self.post_order(self.payload)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(replayed["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_expired_key_is_processed_again(self):
+        self.post_order(self.payload)
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self.post_order(self.payload)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_validation_error_is_not_stored(self):
+        response = self.post_order({**self.payload, "items": []})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
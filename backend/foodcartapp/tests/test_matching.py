@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from foodcartapp.matching import match_orders
+from foodcartapp.models import (
+    Order,
+    OrderItem,
+    Product,
+    Restaurant,
+    RestaurantMenuItem,
+)
+
+
+class MatchOrdersTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.fries = Product.objects.create(name="Картошка", price=50, image="f.jpg")
+
+        self.near = self.create_restaurant("Рядом", 55.75, 37.62)
+        self.far = self.create_restaurant("Далеко", 55.85, 37.62)
+        self.no_fries = self.create_restaurant("Без картошки", 55.76, 37.62)
+
+        for restaurant in [self.near, self.far, self.no_fries]:
+            RestaurantMenuItem.objects.create(restaurant=restaurant, product=self.burger)
+        RestaurantMenuItem.objects.create(restaurant=self.near, product=self.fries)
+        RestaurantMenuItem.objects.create(restaurant=self.far, product=self.fries)
+        RestaurantMenuItem.objects.create(
+            restaurant=self.no_fries, product=self.fries, availability=False
+        )
+
+    def create_restaurant(self, name, lat, lon):
+        restaurant = Restaurant.objects.create(name=name, address=f"{name}, 1")
+        Restaurant.objects.filter(pk=restaurant.pk).update(latitude=lat, longitude=lon)
+        restaurant.refresh_from_db()
+        return restaurant
+
+    def create_order(self, products, coords=(55.74, 37.62)):
+        order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="Москва, Красная площадь, 1",
+        )
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, fixed_price=product.price)
+        Order.objects.filter(pk=order.pk).update(latitude=coords[0], longitude=coords[1])
+        order.refresh_from_db()
+        return order
+
+    def test_restaurants_sorted_by_distance(self):
+        """Подходят только рестораны со всеми товарами, ближайший — первый"""
+        order = self.create_order([self.burger, self.fries])
+
+        matches = match_orders([order])[order.id]
+
+        self.assertEqual(
+            [match["restaurant"] for match in matches], [self.near, self.far]
+        )
+        self.assertLess(matches[0]["distance"], matches[1]["distance"])
+
+    def test_matches_single_order_api(self):
+        """Результат совпадает с Order.get_available_restaurants"""
+        order = self.create_order([self.burger, self.fries])
+
+        matched = {match["restaurant"] for match in match_orders([order])[order.id]}
+
+        self.assertEqual(matched, set(order.get_available_restaurants()))
+
+    def test_order_without_coordinates(self):
+        order = self.create_order([self.burger], coords=(None, None))
+
+        self.assertEqual(match_orders([order]), {order.id: []})
+
+    def test_query_count_does_not_depend_on_orders(self):
+        """Число запросов одинаково для одного и для многих заказов"""
+        orders = [self.create_order([self.burger, self.fries]) for _ in range(10)]
+        match_orders(orders[:1])
+
+        with self.assertNumQueries(2):
+            match_orders(orders[:1])
+        with self.assertNumQueries(2):
+            matches = match_orders(orders)
+        self.assertEqual(len(matches), 10)
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from foodcartapp.models import Product, Restaurant, RestaurantMenuItem
+from star_burger.metrics import QueryBudgetExceeded, registry
+
+
+class RequestMetricsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        restaurant = Restaurant.objects.create(name="Бургерная")
+        RestaurantMenuItem.objects.create(restaurant=restaurant, product=burger)
+        self.manager = User.objects.create_user(
+            "manager", password="secret", is_staff=True
+        )
+
+    def test_requests_are_counted_by_view(self):
+        self.client.get("/api/products/")
+        self.client.get("/api/products/")
+
+        totals = registry.snapshot()["product_list_api"]
+        self.assertEqual(totals["requests"], 2)
+        self.assertGreater(totals["queries"], 0)
+        self.assertGreater(totals["view_seconds"], 0)
+        self.assertEqual(totals["over_budget"], 0)
+
+    def test_metrics_endpoint(self):
+        self.client.get("/api/products/")
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+        with self.settings(METRICS_TOKEN="secret"):
+            response = self.client.get(
+                reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertContains(
+            response, 'star_burger_requests_total{view="product_list_api"} 1'
+        )
+        self.assertContains(response, "# TYPE star_burger_db_seconds_total counter")
+        self.assertContains(response, "star_burger_geocoder_cache_hits_total ")
+
+    def test_query_budget(self):
+        self.client.force_login(self.manager)
+        url = reverse("restaurateur:view_orders")
+
+        with self.settings(QUERY_BUDGETS={"restaurateur:view_orders": 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(url)
+            with self.settings(QUERY_BUDGET_STRICT=False):
+                with self.assertLogs("star_burger.metrics", "WARNING"):
+                    response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            registry.snapshot()["restaurateur:view_orders"]["over_budget"], 2
+        )
@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from foodcartapp.models import Order, OrderItem, Product
+from geocoder import cache as geocoder_cache
+from geocoder.backends import stub
+from geocoder.tasks import locate, pending_addresses, process_batch
+
+
+class OrderBatchApiTestCase(TestCase):
+
+    def setUp(self):
+        geocoder_cache.reset_coordinates_cache()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.fries = Product.objects.create(name="Картошка", price=50, image="f.jpg")
+
+    def order_payload(self, address="Москва, Красная площадь, 1", items=None):
+        return {
+            "firstname": "Иван",
+            "lastname": "Иванов",
+            "phonenumber": "+79001234567",
+            "address": address,
+            "items": items or [
+                {"product": self.burger.id, "quantity": 2},
+                {"product": self.fries.id, "quantity": 1},
+            ],
+        }
+
+    def post_batch(self, payloads):
+        return self.client.post(
+            "/api/orders/batch/", payloads, content_type="application/json"
+        )
+
+    def test_creates_all_orders(self):
+        response = self.post_batch([self.order_payload(), self.order_payload()])
+
+        self.assertEqual(response.status_code, 201)
+        results = response.json()["results"]
+        self.assertEqual([result["status"] for result in results], ["created"] * 2)
+        self.assertEqual(OrderItem.objects.count(), 4)
+        self.assertEqual(set(Order.objects.values_list("total", flat=True)), {250})
+
+    def test_product_id_as_string(self):
+        """Номер товара строкой принимается так же, как в /api/order/"""
+        items = [{"product": str(self.burger.id), "quantity": 1}]
+
+        response = self.post_batch([self.order_payload(items=items)])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(OrderItem.objects.get().product, self.burger)
+
+    def test_partial_failure(self):
+        response = self.post_batch([
+            self.order_payload(),
+            self.order_payload(items=[{"product": 9999, "quantity": 1}]),
+        ])
+
+        self.assertEqual(response.status_code, 207)
+        created, failed = response.json()["results"]
+        self.assertEqual(created["status"], "created")
+        self.assertTrue(Order.objects.filter(pk=created["id"]).exists())
+        self.assertEqual(failed["status"], "error")
+        self.assertIn("items", failed["errors"])
+        self.assertEqual(Order.objects.count(), 1)
+
+    @patch("foodcartapp.batch.locate", wraps=locate)
+    def test_shared_address_geocoded_once(self, mock_locate):
+        self.post_batch([
+            self.order_payload("ул. Ленина, 1"),
+            self.order_payload("улица Ленина 1"),
+            self.order_payload("ул. Ленина, 2"),
+        ])
+
+        self.assertEqual(mock_locate.call_count, 2)
+
+    @override_settings(GEOCODER_BACKEND="geocoder.backends.stub")
+    def test_every_spelling_gets_coordinates(self):
+        spellings = ["ул. Ленина, 1", "улица Ленина 1"]
+        self.post_batch([self.order_payload(address) for address in spellings])
+
+        self.assertEqual(pending_addresses(spellings), set(spellings))
+        with patch("geocoder.cache.geocode", wraps=stub) as mock_geocode:
+            process_batch()
+
+        mock_geocode.assert_called_once()
+        (coordinates,) = set(Order.objects.values_list("latitude", "longitude"))
+        self.assertIn(coordinates, {stub(address) for address in spellings})
+
+    def test_rejects_non_list(self):
+        response = self.post_batch(self.order_payload())
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from foodcartapp.models import Order, Product
+from geocoder import cache as geocoder_cache
+
+
+class OrderIntakeTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        geocoder_cache.reset_coordinates_cache()
+        self.products = [
+            Product.objects.create(
+                name=f"Бургер {number}", price=100 + number, image="b.jpg"
+            )
+            for number in range(10)
+        ]
+
+    def post_order(self, products):
+        return self.client.post(
+            "/api/order/",
+            {
+                "firstname": "Иван",
+                "lastname": "Иванов",
+                "phonenumber": "+79001234567",
+                "address": "Москва, Красная площадь, 1",
+                "items": [{"product": product.id, "quantity": 2} for product in products],
+            },
+            content_type="application/json",
+        )
+
+    def test_creates_order_with_fixed_prices(self):
+        response = self.post_order(self.products[:2])
+
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(pk=response.json()["id"])
+        self.assertEqual(
+            sorted(order.items.values_list("fixed_price", flat=True)), [100, 101]
+        )
+        self.assertEqual(order.total, 402)
+
+    def test_unknown_product(self):
+        response = self.client.post(
+            "/api/order/",
+            {
+                "firstname": "Иван",
+                "lastname": "Иванов",
+                "phonenumber": "+79001234567",
+                "address": "Москва, Красная площадь, 1",
+                "items": [
+                    {"product": self.products[0].id, "quantity": 1},
+                    {"product": 9999, "quantity": 1},
+                ],
+            },
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["items"][1]["product"], ["Товар с ID 9999 не существует"]
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_statements_do_not_depend_on_items(self):
+        """Число запросов одинаково для заказа из одной и из десяти позиций"""
+        self.post_order(self.products[:1])
+
+        with CaptureQueriesContext(connection) as single:
+            self.post_order(self.products[:1])
+        with self.assertNumQueries(len(single.captured_queries)):
+            self.post_order(self.products)
@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from foodcartapp.models import Order, OrderItem, Product
+from foodcartapp.serializers import OrderSerializer
+
+
+class OrderTotalTestCase(TestCase):
+
+    def setUp(self):
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.fries = Product.objects.create(name="Картошка", price=50, image="f.jpg")
+        self.order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="Москва, Красная площадь, 1",
+        )
+
+    def get_total(self):
+        return Order.objects.get(pk=self.order.pk).total
+
+    def test_serializer_stores_total(self):
+        """Сумма считается при создании заказа через bulk_create"""
+        serializer = OrderSerializer(data={
+            "firstname": "Иван",
+            "lastname": "Иванов",
+            "phonenumber": "+79001234567",
+            "address": "Москва, Красная площадь, 1",
+            "items": [
+                {"product": self.burger.id, "quantity": 2},
+                {"product": self.fries.id, "quantity": 1},
+            ],
+        })
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save()
+
+        self.assertEqual(Order.objects.get(pk=order.pk).total, Decimal("250.00"))
+
+    def test_item_changes_update_total(self):
+        # Позиция, сумма заказа и событие для доски заказов
+        with self.assertNumQueries(3):
+            item = OrderItem.objects.create(
+                order=self.order, product=self.burger, quantity=2, fixed_price=100
+            )
+        OrderItem.objects.create(
+            order=self.order, product=self.fries, quantity=1, fixed_price=50
+        )
+        self.assertEqual(self.get_total(), Decimal("250.00"))
+
+        item.quantity = 1
+        item.save()
+        self.assertEqual(self.get_total(), Decimal("150.00"))
+
+        item.delete()
+        self.assertEqual(self.get_total(), Decimal("50.00"))
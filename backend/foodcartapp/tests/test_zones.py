@@ -0,0 +1,111 @@
+import numpy as np
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from foodcartapp.matching import match_orders
+from foodcartapp.models import (
+    DeliveryZone,
+    Order,
+    OrderItem,
+    Product,
+    Restaurant,
+    RestaurantMenuItem,
+    validate_polygon,
+)
+from foodcartapp.zones import ZoneIndex, points_in_polygon
+
+# Буква «П»: вырез между ножками не входит в зону
+U_SHAPE = [[0, 0], [3, 0], [3, 3], [0, 3], [0, 2], [2, 2], [2, 1], [0, 1]]
+
+
+class PointInPolygonTestCase(SimpleTestCase):
+
+    def test_concave_polygon(self):
+        points = np.array([[2.5, 1.5], [1.0, 1.5], [0.5, 0.5], [0.5, 2.5], [4, 1]])
+
+        inside = points_in_polygon(points, np.array(U_SHAPE, dtype=float))
+
+        self.assertEqual(inside.tolist(), [True, False, True, True, False])
+
+    def test_zone_index(self):
+        index = ZoneIndex([(1, U_SHAPE), (1, [[10, 10], [11, 10], [11, 11]])])
+
+        covered = index.covers(
+            [(0.5, 0.5), (1.0, 1.5), (10.9, 10.1), (None, None)], [1, 2]
+        )
+
+        self.assertEqual(
+            covered.tolist(),
+            [[True, True], [False, True], [True, True], [False, False]],
+        )
+
+    def test_polygon_validation(self):
+        validate_polygon([[55.7, 37.5], [55.8, 37.5], [55.8, 37.7]])
+        for polygon in [
+            [[55.7, 37.5], [55.8, 37.5]],
+            [[55.7, 37.5], [95, 37], [1, 1]],
+            "[]",
+        ]:
+            with self.assertRaises(ValidationError):
+                validate_polygon(polygon)
+
+
+class DeliveryZoneMatchingTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.near = Restaurant.objects.create(
+            name="Рядом", latitude=55.75, longitude=37.62
+        )
+        self.far = Restaurant.objects.create(
+            name="Далеко", latitude=55.80, longitude=37.62
+        )
+        for restaurant in [self.near, self.far]:
+            RestaurantMenuItem.objects.create(
+                restaurant=restaurant, product=self.burger
+            )
+
+        self.order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="Москва, Красная площадь, 1",
+        )
+        OrderItem.objects.create(order=self.order, product=self.burger, fixed_price=100)
+        Order.objects.filter(pk=self.order.pk).update(latitude=55.74, longitude=37.62)
+        self.order.refresh_from_db()
+
+    def matched_restaurants(self):
+        return [
+            item["restaurant"] for item in match_orders([self.order])[self.order.id]
+        ]
+
+    def test_out_of_zone_restaurant_is_skipped(self):
+        self.assertEqual(self.matched_restaurants(), [self.near, self.far])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DeliveryZone.objects.create(
+                restaurant=self.near,
+                polygon=[
+                    [55.745, 37.6],
+                    [55.76, 37.6],
+                    [55.76, 37.64],
+                    [55.745, 37.64],
+                ],
+            )
+
+        self.assertEqual(self.matched_restaurants(), [self.far])
+
+    def test_any_of_several_zones(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            DeliveryZone.objects.create(
+                restaurant=self.near, polygon=[[0, 0], [1, 0], [1, 1]]
+            )
+            DeliveryZone.objects.create(
+                restaurant=self.near,
+                polygon=[[55.7, 37.6], [55.76, 37.6], [55.76, 37.64], [55.7, 37.64]],
+            )
+
+        self.assertEqual(self.matched_restaurants(), [self.near, self.far])
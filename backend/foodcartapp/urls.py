@@ -1,9 +1,15 @@
 from django.urls import path
 
-from .views import OrderCreateView, product_list_api, banners_list_api
+from .views import (
+    OrderBatchCreateView,
+    OrderCreateView,
+    product_list_api,
+    banners_list_api,
+)
 
 urlpatterns = [
-    path('products/', product_list_api),
-    path('banners/', banners_list_api),
+    path('products/', product_list_api, name='product_list_api'),
+    path('banners/', banners_list_api, name='banners_list_api'),
     path('order/', OrderCreateView.as_view(), name='order'),
+    path('orders/batch/', OrderBatchCreateView.as_view(), name='orders_batch'),
 ]
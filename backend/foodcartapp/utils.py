@@ -1,8 +1,9 @@
 import logging
+import math
 import requests
 
-from geopy import distance
-from foodcartapp.models import AddressCoordinates  # Импортируем модель
+from foodcartapp.distances import ELLIPSOIDAL, distance_matrix
+from geocoder.models import AddressCoordinates
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +37,7 @@ def get_coordinates(address):
 def calculate_distance(point_a, point_b):
     if not point_a or not point_b:
         return None
-    try:
-        return round(distance.distance(point_a, point_b).km, 1)
-    except Exception as e:
-        logger.error(f"Distance calculation error: {str(e)}")
+    distance = distance_matrix([point_a], [point_b], method=ELLIPSOIDAL)[0, 0]
+    if math.isnan(distance):
         return None
+    return float(distance)
@@ -0,0 +1,62 @@
+import uuid
+
+from django.core.cache import cache
+
+
+def version_key(name):
+    return f"version:{name}"
+
+
+def new_version():
+    return uuid.uuid4().hex
+
+
+def get_version(name):
+    """Текущая версия набора данных name, общая для всех процессов.
+
+    Хранится в общем кэше Django. Если ключ пропал (кэш очищен), версия
+    начинается заново со случайной метки, чтобы не совпасть с выданными ранее.
+    """
+    version = cache.get(version_key(name))
+    if version is None:
+        cache.add(version_key(name), new_version(), timeout=None)
+        version = cache.get(version_key(name))
+    return version
+
+
+def bump_version(name):
+    """Выдаёт набору данных новую версию.
+
+    Версия — случайная метка, а не счётчик: incr в файловом кэше не атомарен,
+    и из двух одновременных увеличений одно могло потеряться. Две записи
+    меток в худшем случае перезапишут друг друга, но обе отличаются от
+    старой версии, так что устаревшее значение не останется в обороте.
+    """
+    version = new_version()
+    cache.set(version_key(name), version, timeout=None)
+    return version
+
+
+# Копии данных в памяти процесса: {name: (версия, значение)}
+_local_values = {}
+
+
+def get_versioned(name, build, timeout):
+    """Значение набора данных name для текущей версии.
+
+    Каждый процесс держит свою копию и сверяет с общим кэшем только номер
+    версии. Когда версия меняется, значение берётся из общего кэша или
+    собирается заново вызовом build().
+    """
+    version = get_version(name)
+    local_version, value = _local_values.get(name, (None, None))
+    if local_version == version:
+        return value
+
+    key = f"{name}:{version}"
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout=timeout)
+    _local_values[name] = (version, value)
+    return value
@@ -1,11 +1,25 @@
-from rest_framework import generics
+from functools import lru_cache
+
+from rest_framework import generics, views
 from rest_framework.response import Response
 from rest_framework import status
 
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.templatetags.static import static
 
-from .models import Product, Order
+from .batch import MAX_BATCH_SIZE, create_orders
+from .catalogue import (
+    PAGE_PARAMS,
+    CatalogueQueryError,
+    get_catalogue_etag,
+    get_catalogue_variants,
+    get_catalogue_version,
+    parse_page_params,
+    stream_catalogue_page,
+)
+from .compression import compress_variants, dump_json, precompressed_response, wants_pretty
+from .idempotency import idempotent
+from .models import Order
 from .serializers import OrderSerializer
 
 
@@ -13,6 +27,7 @@ class OrderCreateView(generics.CreateAPIView):
     serializer_class = OrderSerializer
     queryset = Order.objects.all()
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -20,8 +35,33 @@ class OrderCreateView(generics.CreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-def banners_list_api(request):
-    return JsonResponse([
+class OrderBatchCreateView(views.APIView):
+    def post(self, request, *args, **kwargs):
+        payloads = request.data
+        if not isinstance(payloads, list) or not payloads:
+            return Response(
+                {"error": "Ожидается непустой список заказов"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(payloads) > MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"Не больше {MAX_BATCH_SIZE} заказов за запрос"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = create_orders(payloads)
+        created = sum(result["status"] == "created" for result in results)
+        if created == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"results": results}, status=response_status)
+
+
+def get_banners():
+    return [
         {
             "title": "Burger",
             "src": static("burger.jpg"),
@@ -37,26 +77,39 @@ def banners_list_api(request):
             "src": static("tasty.jpg"),
             "text": "Food is incomplete without a tasty dessert",
         },
-    ], safe=False, json_dumps_params={"ensure_ascii": False, "indent": 4})
+    ]
+
+
+@lru_cache(maxsize=None)
+def get_banner_variants(pretty):
+    return compress_variants(dump_json(get_banners(), pretty=pretty).encode())
+
+
+def banners_list_api(request):
+    pretty = wants_pretty(request)
+    return precompressed_response(request, lambda: get_banner_variants(pretty))
 
 
 def product_list_api(request):
-    products = Product.objects.select_related("category").available()
-    return JsonResponse([
-        {
-            "id": product.id,
-            "name": product.name,
-            "price": product.price,
-            "special_status": product.special_status,
-            "description": product.description,
-            "category": {
-                "id": product.category.id,
-                "name": product.category.name,
-            } if product.category else None,
-            "image": product.image.url,
-            "restaurant": {
-                "id": product.id,
-                "name": product.name,
-            }
-        } for product in products
-    ], safe=False, json_dumps_params={"ensure_ascii": False, "indent": 4})
+    if PAGE_PARAMS & request.GET.keys():
+        return product_page_api(request)
+
+    pretty = wants_pretty(request)
+    version = get_catalogue_version()
+    response = precompressed_response(
+        request,
+        lambda: get_catalogue_variants(version, pretty),
+        etag=get_catalogue_etag(version, pretty),
+    )
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def product_page_api(request):
+    try:
+        page = parse_page_params(request.GET)
+    except CatalogueQueryError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return StreamingHttpResponse(
+        stream_catalogue_page(page), content_type="application/json"
+    )
@@ -0,0 +1,84 @@
+import numpy as np
+from django.conf import settings
+
+from foodcartapp.models import DeliveryZone
+from foodcartapp.versions import get_versioned
+
+ZONES_VERSION = "delivery_zones"
+
+
+def points_in_polygon(points, polygon):
+    """Для каждой точки n×2 (широта, долгота) — лежит ли она внутри
+    многоугольника polygon m×2. Лучевой алгоритм, посчитанный сразу для
+    всех точек: по одному векторному шагу на каждое ребро.
+    """
+    latitudes, longitudes = points[:, 0], points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
+    previous = polygon[-1]
+    for vertex in polygon:
+        (lat_a, lon_a), (lat_b, lon_b) = previous, vertex
+        previous = vertex
+        if lat_a == lat_b:
+            continue
+        crosses = (lat_a > latitudes) != (lat_b > latitudes)
+        crossing_longitude = lon_a + (latitudes - lat_a) * (lon_b - lon_a) / (
+            lat_b - lat_a
+        )
+        inside ^= crosses & (longitudes < crossing_longitude)
+    return inside
+
+
+class ZoneIndex:
+    """Подготовленные зоны доставки: для каждого ресторана — список
+    (рамка, вершины) его многоугольников.
+
+    Рамка отсекает далёкие точки дёшево, лучевой тест выполняется только
+    для точек внутри неё. Ресторан без зон доставляет куда угодно.
+    """
+
+    def __init__(self, zones=()):
+        self.zones = {}
+        for restaurant_id, polygon in zones:
+            vertices = np.array(polygon, dtype=float)
+            bounds = (*vertices.min(axis=0), *vertices.max(axis=0))
+            self.zones.setdefault(restaurant_id, []).append((bounds, vertices))
+
+    def covers(self, points, restaurant_ids):
+        """Матрица len(points)×len(restaurant_ids): попадает ли точка в зону
+        ресторана. Точки без координат не попадают ни в одну зону.
+        """
+        points = np.array(
+            [(np.nan, np.nan) if None in point else point for point in points],
+            dtype=float,
+        ).reshape(-1, 2)
+        located = ~np.isnan(points).any(axis=1)
+        result = np.zeros((len(points), len(restaurant_ids)), dtype=bool)
+        for column, restaurant_id in enumerate(restaurant_ids):
+            zones = self.zones.get(restaurant_id)
+            if zones is None:
+                result[:, column] = located
+                continue
+            for (min_lat, min_lon, max_lat, max_lon), vertices in zones:
+                candidates = np.flatnonzero(
+                    located
+                    & ~result[:, column]
+                    & (points[:, 0] >= min_lat)
+                    & (points[:, 0] <= max_lat)
+                    & (points[:, 1] >= min_lon)
+                    & (points[:, 1] <= max_lon)
+                )
+                if len(candidates):
+                    result[candidates, column] = points_in_polygon(
+                        points[candidates], vertices
+                    )
+        return result
+
+
+def build_zone_index():
+    return ZoneIndex(DeliveryZone.objects.values_list("restaurant_id", "polygon"))
+
+
+def get_zone_index():
+    return get_versioned(
+        ZONES_VERSION, build_zone_index, settings.CATALOGUE_CACHE_TIMEOUT
+    )
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import GeocodingTask
+
+
+@admin.register(GeocodingTask)
+class GeocodingTaskAdmin(admin.ModelAdmin):
+    list_display = ["address", "status", "attempts", "next_attempt_at", "last_error"]
+    list_filter = ["status"]
+    search_fields = ["address"]
@@ -0,0 +1,53 @@
+import hashlib
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from star_burger import metrics
+
+YANDEX_GEOCODER_URL = "https://geocode-maps.yandex.ru/1.x/"
+
+
+def yandex(address, session=None):
+    """Запрашивает координаты у Яндекс.Геокодера.
+
+    Возвращает (широта, долгота) или None, если адрес не найден.
+    Сетевые ошибки пробрасываются как requests.RequestException.
+    """
+    response = (session or requests).get(
+        YANDEX_GEOCODER_URL,
+        params={
+            "apikey": settings.YANDEX_GEOCODER_API_KEY,
+            "format": "json",
+            "geocode": address,
+        },
+        timeout=settings.GEOCODER_TIMEOUT,
+    )
+    response.raise_for_status()
+
+    collection = response.json().get("response", {}).get("GeoObjectCollection", {})
+    features = collection.get("featureMember", [])
+    if not features:
+        return None
+    lon, lat = map(float, features[0]["GeoObject"]["Point"]["pos"].split())
+    return lat, lon
+
+
+def stub(address, session=None):
+    """Локальный геокодер для тестов и бенчмарков: без сети, детерминированно.
+
+    Раскладывает адреса по окрестностям Москвы по хэшу строки.
+    """
+    if not address.strip():
+        return None
+    digest = hashlib.md5(address.encode()).digest()
+    lat = 55.55 + digest[0] / 255 * 0.4
+    lon = 37.35 + digest[1] / 255 * 0.55
+    return round(lat, 6), round(lon, 6)
+
+
+def geocode(address, session=None):
+    backend = import_string(settings.GEOCODER_BACKEND)
+    with metrics.track_geocoder():
+        return backend(address, session=session)
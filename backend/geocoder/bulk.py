@@ -0,0 +1,96 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from geocoder.backends import geocode
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Ограничитель частоты запросов: не больше rate запросов в секунду.
+
+    capacity задаёт, сколько запросов можно отправить пачкой после простоя.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class BulkGeocoder:
+    """Геокодирует много адресов параллельно через пул HTTP-сессий.
+
+    Каждый поток держит свою requests.Session с пулом соединений, общая
+    частота запросов ограничена TokenBucket, сетевые ошибки повторяются
+    с экспоненциальной задержкой.
+    """
+
+    def __init__(self, workers=8, rate=10, retries=3, backoff=0.5):
+        self.workers = workers
+        self.bucket = TokenBucket(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.local = threading.local()
+
+    def get_session(self):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.local.session = session
+        return session
+
+    def resolve(self, address):
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                return geocode(address, session=self.get_session())
+            except requests.exceptions.RequestException as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2**attempt * (1 + random.random())
+                logger.warning(
+                    f"Geocoder request failed for {address}: {str(e)}, "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    def resolve_all(self, addresses):
+        """Возвращает итератор пар (адрес, координаты или исключение) по мере готовности."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self.resolve, address): address for address in addresses
+            }
+            for future in as_completed(futures):
+                address = futures[future]
+                try:
+                    yield address, future.result()
+                except requests.exceptions.RequestException as e:
+                    yield address, e
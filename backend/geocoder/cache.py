@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from geocoder.backends import geocode
+from geocoder.models import AddressCoordinates
+from geocoder.normalize import canonical_address
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class LRUCache:
+    """Ограниченный по размеру кэш процесса с TTL на каждую запись.
+
+    Отрицательные результаты (адрес без координат) живут negative_ttl
+    секунд, обычные — ttl секунд.
+    """
+
+    def __init__(self, maxsize, ttl, negative_ttl, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, negative=False):
+        ttl = self.negative_ttl if negative else self.ttl
+        with self.lock:
+            self.entries[key] = (self.clock() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_coordinates_cache = None
+
+
+def get_coordinates_cache():
+    global _coordinates_cache
+    if _coordinates_cache is None:
+        _coordinates_cache = LRUCache(
+            maxsize=settings.GEOCODER_CACHE_SIZE,
+            ttl=settings.GEOCODER_CACHE_TTL,
+            negative_ttl=settings.GEOCODER_NEGATIVE_CACHE_TTL,
+        )
+    return _coordinates_cache
+
+
+def reset_coordinates_cache():
+    global _coordinates_cache
+    _coordinates_cache = None
+
+
+def cache_coordinates(address, coordinates):
+    get_coordinates_cache().set(
+        canonical_address(address),
+        coordinates,
+        negative=coordinates == (None, None),
+    )
+
+
+def get_cached(address):
+    """Ищет координаты в кэше процесса, затем в БД, не обращаясь к API.
+
+    Оба уровня ищут по нормализованному адресу (см. geocoder.normalize).
+
+    Возвращает (record, coordinates): record — запись AddressCoordinates,
+    если к ней пришлось обратиться, иначе None. coordinates равно None,
+    если адрес не встречался; (None, None) — если адрес известен, но
+    координат у него нет.
+    """
+    coordinates = get_coordinates_cache().get(canonical_address(address))
+    if coordinates is not MISSING:
+        return None, coordinates
+
+    record = AddressCoordinates.objects.for_address(address).first()
+    if record is None:
+        return None, None
+    coordinates = (record.latitude, record.longitude)
+    if not record.requires_refresh():
+        cache_coordinates(address, coordinates)
+    return record, coordinates
+
+
+def lookup(address, session=None):
+    """Многоуровневый поиск координат: кэш процесса → БД → API геокодера.
+
+    Ответ API сохраняется в БД и кэш, в том числе «адрес не найден».
+    Возвращает (широта, долгота) или (None, None). Сетевые ошибки
+    пробрасываются как requests.RequestException: повторять запрос
+    решает очередь геокодирования.
+    """
+    record, coordinates = get_cached(address)
+    if coordinates is not None and (record is None or not record.requires_refresh()):
+        return coordinates
+
+    coordinates = geocode(address, session=session)
+    if coordinates is None:
+        logger.warning(f"No coordinates found for address: {address}")
+    coordinates = coordinates or (None, None)
+    AddressCoordinates.objects.store(address, *coordinates)
+    cache_coordinates(address, coordinates)
+    return coordinates
+
+
+def stats():
+    return get_coordinates_cache().stats()
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from geocoder.models import AddressCoordinates
+from geocoder.normalize import canonical_address
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает нормализованные адреса и объединяет записи "
+        "AddressCoordinates с одинаковым ключом"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Показать, что будет объединено, и откатить изменения",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+
+        with transaction.atomic():
+            outdated = [
+                record
+                for record in AddressCoordinates.objects.only(
+                    "id", "address", "canonical_key"
+                )
+                if record.canonical_key != canonical_address(record.address)
+            ]
+            for record in outdated:
+                record.canonical_key = canonical_address(record.address)
+            AddressCoordinates.objects.bulk_update(
+                outdated, ["canonical_key"], batch_size=500
+            )
+            self.stdout.write(f"Обновлено ключей: {len(outdated)}")
+
+            duplicate_keys = (
+                AddressCoordinates.objects.values("canonical_key")
+                .annotate(records=Count("id"))
+                .filter(records__gt=1)
+                .values_list("canonical_key", flat=True)
+            )
+            removed = 0
+            for key in duplicate_keys:
+                keep, *duplicates = self.rank(
+                    AddressCoordinates.objects.filter(canonical_key=key)
+                )
+                for duplicate in duplicates:
+                    self.stdout.write(f"{duplicate.address} → {keep.address}")
+                removed += len(duplicates)
+                AddressCoordinates.objects.filter(
+                    pk__in=[duplicate.pk for duplicate in duplicates]
+                ).delete()
+            self.stdout.write(self.style.SUCCESS(f"Удалено дубликатов: {removed}"))
+
+            if dry_run:
+                transaction.set_rollback(True)
+
+    @staticmethod
+    def rank(records):
+        """Первой идёт запись, которую стоит оставить: с координатами и самая свежая."""
+        return sorted(
+            records,
+            key=lambda record: (record.latitude is not None, record.updated_at),
+            reverse=True,
+        )
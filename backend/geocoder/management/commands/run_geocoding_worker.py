@@ -0,0 +1,37 @@
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from geocoder.tasks import process_batch
+
+
+class Command(BaseCommand):
+    help = "Геокодирует адреса из очереди GeocodingTask и записывает координаты"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Пауза в секундах, когда очередь пуста",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Обработать одну пачку и выйти"
+        )
+
+    def handle(self, *args, **options):
+        session = requests.Session()
+        while True:
+            # Вне HTTP-запросов Django сам не проверяет соединение с БД
+            # и не закрывает его по DB_CONN_MAX_AGE
+            close_old_connections()
+            processed = process_batch(options["batch_size"], session=session)
+            if processed:
+                self.stdout.write(f"Обработано адресов: {processed}")
+            if options["once"]:
+                break
+            if not processed:
+                time.sleep(options["interval"])
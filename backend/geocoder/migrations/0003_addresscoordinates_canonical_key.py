@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:29
+
+from django.db import migrations, models
+
+from geocoder.normalize import canonical_address
+
+
+def fill_canonical_keys(apps, schema_editor):
+    AddressCoordinates = apps.get_model("geocoder", "AddressCoordinates")
+    records = list(AddressCoordinates.objects.only("id", "address"))
+    for record in records:
+        record.canonical_key = canonical_address(record.address)
+    AddressCoordinates.objects.bulk_update(records, ["canonical_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geocoder", "0002_geocodingtask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="addresscoordinates",
+            name="canonical_key",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=200,
+                verbose_name="Нормализованный адрес",
+            ),
+        ),
+        migrations.RunPython(fill_canonical_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from geocoder.normalize import canonical_address
+
+
+def refresh_canonical_keys(apps, schema_editor):
+    """Литеры «д» и «г» после номера дома больше не отбрасываются."""
+    AddressCoordinates = apps.get_model("geocoder", "AddressCoordinates")
+    records = list(AddressCoordinates.objects.only("id", "address", "canonical_key"))
+    changed = []
+    for record in records:
+        key = canonical_address(record.address)
+        if key != record.canonical_key:
+            record.canonical_key = key
+            changed.append(record)
+    AddressCoordinates.objects.bulk_update(changed, ["canonical_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geocoder", "0003_addresscoordinates_canonical_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(refresh_canonical_keys, migrations.RunPython.noop),
+    ]
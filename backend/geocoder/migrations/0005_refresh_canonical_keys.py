@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from geocoder.normalize import canonical_address
+
+
+def refresh_canonical_keys(apps, schema_editor):
+    """«г.» и «гор.» теперь отбрасываются одинаково, а «д» перед новым
+    номером — сокращение «дом», а не литера предыдущего.
+    """
+    AddressCoordinates = apps.get_model("geocoder", "AddressCoordinates")
+    records = list(AddressCoordinates.objects.only("id", "address", "canonical_key"))
+    changed = []
+    for record in records:
+        key = canonical_address(record.address)
+        if key != record.canonical_key:
+            record.canonical_key = key
+            changed.append(record)
+    AddressCoordinates.objects.bulk_update(changed, ["canonical_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geocoder", "0004_refresh_canonical_keys"),
+    ]
+
+    operations = [
+        migrations.RunPython(refresh_canonical_keys, migrations.RunPython.noop),
+    ]
@@ -1,18 +1,37 @@
-import requests
-
 from django.conf import settings
 from django.db import models
 
 from django.utils import timezone
 from datetime import timedelta
 
-import logging
+from geocoder.normalize import canonical_address
+
+
+class AddressCoordinatesQuerySet(models.QuerySet):
+    def for_address(self, address):
+        return self.filter(canonical_key=canonical_address(address)).order_by(
+            "-updated_at"
+        )
 
-logger = logging.getLogger(__name__)
+    def store(self, address, latitude, longitude):
+        record = self.for_address(address).first()
+        if record is None:
+            return self.create(address=address, latitude=latitude, longitude=longitude)
+        record.latitude = latitude
+        record.longitude = longitude
+        record.save(update_fields=["latitude", "longitude", "updated_at"])
+        return record
 
 
 class AddressCoordinates(models.Model):
     address = models.TextField("Адрес места", max_length=200, unique=True)
+    canonical_key = models.CharField(
+        "Нормализованный адрес",
+        max_length=200,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
     latitude = models.FloatField("Широта", null=True, blank=True)
     longitude = models.FloatField("Долгота", null=True, blank=True)
     updated_at = models.DateTimeField(
@@ -24,6 +43,8 @@ class AddressCoordinates(models.Model):
 
     CACHE_TTL = timezone.timedelta(days=30)
 
+    objects = AddressCoordinatesQuerySet.as_manager()
+
     class Meta:
         verbose_name = "координаты адреса"
         verbose_name_plural = "координаты адресов"
@@ -32,54 +53,62 @@ class AddressCoordinates(models.Model):
             models.Index(fields=["updated_at"]),
         ]
 
-    @classmethod
-    def get_or_create(cls, address):
-        obj, created = cls.objects.get_or_create(address=address)
-        if created or obj.requires_refresh():
-            obj.update_from_api()
-        return obj
+    def save(self, *args, **kwargs):
+        self.canonical_key = canonical_address(self.address)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "address" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "canonical_key"}
+        super().save(*args, **kwargs)
 
     def requires_refresh(self):
         if not self.updated_at:
             return True
-        return (timezone.now() - self.updated_at) > self.CACHE_TTL
-
-    def update_from_api(self):
-        try:
-            response = requests.get(
-                "https://geocode-maps.yandex.ru/1.x/",
-                params={
-                    "apikey": settings.YANDEX_GEOCODER_API_KEY,
-                    "format": "json",
-                    "geocode": self.address,
-                },
-                timeout=5,
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            collection = data.get("response", {}).get("GeoObjectCollection", {})
-            features = collection.get("featureMember", [])
-
-            if features:
-                point = features[0]["GeoObject"]["Point"]
-                lon, lat = map(float, point["pos"].split())
-                self.latitude = lat
-                self.longitude = lon
-            else:
-                logger.warning(f"No coordinates found for address: {self.address}")
-                self.latitude = None
-                self.longitude = None
-            self.save()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed for {self.address}: {str(e)}")
-            if not self.pk:
-                self.delete()
-            raise
-        except Exception as e:
-            logger.error(f"Ошибка обновления координат: {str(e)}")
-        self.save()
-        raise
+        if self.latitude is not None:
+            ttl = self.CACHE_TTL
+        else:
+            # Тот же срок, что и у промахов в кэше процесса
+            ttl = timedelta(seconds=settings.GEOCODER_NEGATIVE_CACHE_TTL)
+        return (timezone.now() - self.updated_at) > ttl
 
     def __str__(self):
         return f"{self.address} ({self.latitude}, {self.longitude})"
+
+
+class GeocodingTaskQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(status=GeocodingTask.PENDING)
+
+    def due(self):
+        return self.pending().filter(next_attempt_at__lte=timezone.now())
+
+
+class GeocodingTask(models.Model):
+    PENDING = "pending"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Ожидает"),
+        (FAILED, "Ошибка"),
+    ]
+
+    address = models.TextField("Адрес", max_length=200, unique=True)
+    status = models.CharField(
+        "Статус", max_length=20, choices=STATUS_CHOICES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+    next_attempt_at = models.DateTimeField(
+        "Следующая попытка", default=timezone.now
+    )
+
+    objects = GeocodingTaskQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "задача геокодирования"
+        verbose_name_plural = "задачи геокодирования"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.address} ({self.get_status_display()})"
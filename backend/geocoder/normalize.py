@@ -0,0 +1,92 @@
+import re
+
+# Сокращения типов улиц и частей адреса → полная форма
+ABBREVIATIONS = {
+    "ул": "улица",
+    "пр": "проспект",
+    "пр-т": "проспект",
+    "просп": "проспект",
+    "пр-кт": "проспект",
+    "пер": "переулок",
+    "пл": "площадь",
+    "б-р": "бульвар",
+    "бул": "бульвар",
+    "бульв": "бульвар",
+    "ш": "шоссе",
+    "наб": "набережная",
+    "пр-д": "проезд",
+    "туп": "тупик",
+    "мкр": "микрорайон",
+    "мкрн": "микрорайон",
+    "д": "дом",
+    "г": "город",
+    "гор": "город",
+    "обл": "область",
+    "р-н": "район",
+    "корп": "корпус",
+    "к": "корпус",
+    "стр": "строение",
+    "кв": "квартира",
+}
+
+# Слова, которые не влияют на адрес: «д. 5» и «5» — один и тот же дом.
+# Проверяются после раскрытия сокращений, так что «г.» и «гор.» тоже
+# отбрасываются. После номера дома «д» и «г» — литеры («34 Д»), если
+# за ними не идёт новый номер («мкр 5, д 12»)
+NOISE_WORDS = {"дом", "город"}
+
+# Однобуквенные сокращения, за которыми идёт номер части дома: «10 к 2»
+BUILDING_PARTS = {"к"}
+
+HOUSE_NUMBER = re.compile(r"^\d+(/\d+)?$")
+HOUSE_LETTER = re.compile(r"^[а-я]$")
+STARTS_WITH_NUMBER = re.compile(r"^\d")
+NUMBER_WITH_SUFFIX = re.compile(r"^(\d+)-?([а-я])$")
+GLUED_ABBREVIATION = re.compile(r"^(\d+[а-я]?)?(к|корп|стр)(\d+)$")
+SEPARATORS = re.compile(r"[\s,.;:!?«»\"'()]+")
+
+
+def tokenize(address):
+    address = address.lower().replace("ё", "е")
+    address = re.sub(r"(\d)\s*-\s*([а-я])\b", r"\1\2", address)
+    return [token for token in SEPARATORS.split(address) if token]
+
+
+def canonical_address(address):
+    """Приводит адрес к каноническому ключу для кэша геокодера.
+
+    Регистр, пробелы, пунктуация, сокращения вида «ул.»/«пр-т» и буквенные
+    литеры дома не влияют на результат:
+
+    >>> canonical_address("ул. Партизана Железняка, 34а")
+    'улица партизана железняка 34а'
+    >>> canonical_address("улица партизана железняка 34 А")
+    'улица партизана железняка 34а'
+    """
+    words = [token.strip("-") for token in tokenize(address)]
+    words = [word for word in words if word]
+    tokens = []
+    for index, token in enumerate(words):
+        following = words[index + 1] if index + 1 < len(words) else ""
+        if (
+            HOUSE_LETTER.match(token)
+            and token not in BUILDING_PARTS
+            and tokens
+            and HOUSE_NUMBER.match(tokens[-1])
+            and not STARTS_WITH_NUMBER.match(following)
+        ):
+            tokens[-1] += token
+            continue
+        glued = GLUED_ABBREVIATION.match(token)
+        if glued:
+            house, abbreviation, number = glued.groups()
+            tokens.extend(filter(None, [house, ABBREVIATIONS[abbreviation], number]))
+            continue
+        suffixed = NUMBER_WITH_SUFFIX.match(token)
+        if suffixed:
+            token = suffixed.group(1) + suffixed.group(2)
+        token = ABBREVIATIONS.get(token, token)
+        if token in NOISE_WORDS:
+            continue
+        tokens.append(token)
+    return " ".join(tokens)
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Отправляется воркером геокодирования, когда координаты адреса получены.
+# Аргументы: address, latitude, longitude.
+address_geocoded = Signal()
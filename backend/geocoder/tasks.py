@@ -0,0 +1,98 @@
+import logging
+from datetime import timedelta
+
+import requests
+from django.db import transaction
+from django.utils import timezone
+
+from geocoder.cache import get_cached, lookup
+from geocoder.models import AddressCoordinates, GeocodingTask
+from geocoder.signals import address_geocoded
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+CLAIM_TIMEOUT = timedelta(minutes=1)
+RETRY_DELAY = timedelta(seconds=30)
+
+
+def enqueue(address):
+    """Ставит адрес в очередь. Задача, исчерпавшая попытки, начинается заново:
+    иначе один сбой геокодера навсегда оставил бы адрес без координат.
+    """
+    GeocodingTask.objects.bulk_create(
+        [GeocodingTask(address=address)], ignore_conflicts=True
+    )
+    GeocodingTask.objects.filter(address=address, status=GeocodingTask.FAILED).update(
+        status=GeocodingTask.PENDING, attempts=0, next_attempt_at=timezone.now()
+    )
+
+
+def locate(address):
+    """Возвращает координаты адреса из кэша или БД, не обращаясь к геокодеру.
+
+    Если адреса ещё нет в базе или запись устарела, адрес ставится в
+    очередь на геокодирование. Пока координат нет, возвращает (None, None).
+    """
+    record, coordinates = get_cached(address)
+    if coordinates is None or (record and record.requires_refresh()):
+        enqueue(address)
+    return coordinates or (None, None)
+
+
+def pending_addresses(addresses):
+    return set(
+        GeocodingTask.objects.pending()
+        .filter(address__in=set(addresses))
+        .values_list("address", flat=True)
+    )
+
+
+def claim_tasks(batch_size):
+    """Забирает пачку задач так, чтобы параллельные воркеры их не дублировали."""
+    with transaction.atomic():
+        tasks = list(
+            GeocodingTask.objects.due()
+            .select_for_update(skip_locked=True)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        GeocodingTask.objects.filter(pk__in=[task.pk for task in tasks]).update(
+            next_attempt_at=timezone.now() + CLAIM_TIMEOUT
+        )
+    return tasks
+
+
+def notify_geocoded(address, coordinates):
+    latitude, longitude = coordinates or (None, None)
+    address_geocoded.send(
+        sender=AddressCoordinates,
+        address=address,
+        latitude=latitude,
+        longitude=longitude,
+    )
+
+
+def postpone(task, error):
+    task.attempts += 1
+    task.last_error = str(error)
+    if task.attempts >= MAX_ATTEMPTS:
+        task.status = GeocodingTask.FAILED
+    task.next_attempt_at = timezone.now() + RETRY_DELAY * 2 ** (task.attempts - 1)
+    task.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def process_batch(batch_size=50, session=None):
+    """Геокодирует пачку адресов из очереди. Возвращает число обработанных задач."""
+    tasks = claim_tasks(batch_size)
+    session = session or requests.Session()
+    for task in tasks:
+        try:
+            coordinates = lookup(task.address, session=session)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API request failed for {task.address}: {str(e)}")
+            postpone(task, e)
+            continue
+        with transaction.atomic():
+            notify_geocoded(task.address, coordinates)
+            task.delete()
+    return len(tasks)
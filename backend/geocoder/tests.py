@@ -1,3 +1,266 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+import requests
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from foodcartapp.models import Order, Restaurant
+from geocoder import cache
+from geocoder.backends import stub
+from geocoder.bulk import TokenBucket
+from geocoder.cache import MISSING, LRUCache
+from geocoder.models import AddressCoordinates, GeocodingTask
+from geocoder.normalize import canonical_address
+from geocoder.tasks import pending_addresses, process_batch
+
+ADDRESS = "Москва, Красная площадь, 1"
+
+
+@override_settings(GEOCODER_BACKEND="geocoder.backends.stub")
+class GeocodingQueueTestCase(TestCase):
+
+    def setUp(self):
+        cache.reset_coordinates_cache()
+
+    def create_order(self):
+        return Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address=ADDRESS,
+        )
+
+    @patch("geocoder.cache.geocode")
+    def test_order_is_saved_without_geocoding(self, mock_geocode):
+        """Заказ сохраняется сразу, адрес попадает в очередь"""
+        order = self.create_order()
+
+        mock_geocode.assert_not_called()
+        self.assertIsNone(order.latitude)
+        self.assertEqual(pending_addresses([ADDRESS]), {ADDRESS})
+
+    def test_worker_fills_coordinates(self):
+        order = self.create_order()
+        restaurant = Restaurant.objects.create(name="Бургерная", address=ADDRESS)
+
+        self.assertEqual(process_batch(), 1)
+
+        order.refresh_from_db()
+        restaurant.refresh_from_db()
+        self.assertEqual((order.latitude, order.longitude), stub(ADDRESS))
+        self.assertEqual((restaurant.latitude, restaurant.longitude), stub(ADDRESS))
+        self.assertFalse(GeocodingTask.objects.exists())
+        self.assertTrue(AddressCoordinates.objects.filter(address=ADDRESS).exists())
+
+    def test_known_address_is_not_queued(self):
+        AddressCoordinates.objects.create(
+            address=ADDRESS, latitude=55.7, longitude=37.6
+        )
+
+        order = self.create_order()
+
+        self.assertEqual((order.latitude, order.longitude), (55.7, 37.6))
+        self.assertFalse(GeocodingTask.objects.exists())
+
+    @patch("geocoder.cache.geocode", side_effect=requests.exceptions.Timeout)
+    def test_failed_request_is_retried_later(self, mock_geocode):
+        self.create_order()
+
+        process_batch()
+
+        task = GeocodingTask.objects.get(address=ADDRESS)
+        self.assertEqual(task.attempts, 1)
+        self.assertEqual(task.status, GeocodingTask.PENDING)
+        self.assertEqual(process_batch(), 0)
+
+    def test_failed_task_is_requeued(self):
+        GeocodingTask.objects.create(
+            address=ADDRESS, status=GeocodingTask.FAILED, attempts=5
+        )
+
+        order = self.create_order()
+
+        task = GeocodingTask.objects.get(address=ADDRESS)
+        self.assertEqual((task.status, task.attempts), (GeocodingTask.PENDING, 0))
+        process_batch()
+        order.refresh_from_db()
+        self.assertIsNotNone(order.latitude)
+
+
+class LRUCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 0
+        self.cache = LRUCache(
+            maxsize=2, ttl=100, negative_ttl=10, clock=lambda: self.now
+        )
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertIs(self.cache.get("b"), MISSING)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_negative_entries_expire_sooner(self):
+        self.cache.set("found", (55.7, 37.6))
+        self.cache.set("not found", (None, None), negative=True)
+        self.now = 50
+
+        self.assertIs(self.cache.get("not found"), MISSING)
+        self.assertEqual(self.cache.get("found"), (55.7, 37.6))
+        self.assertEqual(
+            {key: self.cache.stats()[key] for key in ["hits", "misses", "expirations"]},
+            {"hits": 1, "misses": 1, "expirations": 1},
+        )
+
+
+@override_settings(GEOCODER_BACKEND="geocoder.backends.stub")
+class LookupTestCase(TestCase):
+
+    def setUp(self):
+        cache.reset_coordinates_cache()
+
+    @patch("geocoder.cache.geocode", side_effect=stub)
+    def test_lookup_goes_through_tiers(self, mock_geocode):
+        self.assertEqual(cache.lookup(ADDRESS), stub(ADDRESS))
+        self.assertTrue(AddressCoordinates.objects.filter(address=ADDRESS).exists())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.lookup(ADDRESS), stub(ADDRESS))
+
+        cache.reset_coordinates_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(cache.lookup(ADDRESS), stub(ADDRESS))
+        self.assertEqual(mock_geocode.call_count, 1)
+
+    @patch("geocoder.cache.geocode", side_effect=requests.exceptions.ConnectionError)
+    def test_failed_lookup_is_not_cached(self, mock_geocode):
+        """Сбой сети не запоминается как «адрес не найден»: повтор решает очередь"""
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                cache.lookup(ADDRESS)
+
+        self.assertEqual(mock_geocode.call_count, 2)
+        self.assertFalse(AddressCoordinates.objects.exists())
+
+    def test_not_found_expires_with_setting(self):
+        record = AddressCoordinates.objects.create(address=ADDRESS)
+        AddressCoordinates.objects.filter(pk=record.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=10)
+        )
+        record.refresh_from_db()
+
+        with self.settings(GEOCODER_NEGATIVE_CACHE_TTL=5 * 60):
+            self.assertTrue(record.requires_refresh())
+        with self.settings(GEOCODER_NEGATIVE_CACHE_TTL=60 * 60):
+            self.assertFalse(record.requires_refresh())
+
+
+class CanonicalAddressTestCase(SimpleTestCase):
+
+    def test_spelling_variants_share_key(self):
+        variants = [
+            "ул. Партизана Железняка, 34а",
+            "улица партизана железняка 34А",
+            "Улица Партизана  Железняка, д. 34 «А»",
+            "ул Партизана Железняка 34-а",
+        ]
+        keys = {canonical_address(address) for address in variants}
+
+        self.assertEqual(keys, {"улица партизана железняка 34а"})
+
+    def test_building_and_district_abbreviations(self):
+        self.assertEqual(
+            canonical_address("г. Москва, пр-т Мира, 10к2"),
+            canonical_address("Москва, проспект Мира, дом 10, корп. 2"),
+        )
+
+    def test_different_houses_differ(self):
+        self.assertNotEqual(
+            canonical_address("ул. Ленина, 34а"), canonical_address("ул. Ленина, 34б")
+        )
+
+    def test_letters_д_and_г_are_kept(self):
+        house = canonical_address("ул. Тверская, 34")
+
+        self.assertEqual(canonical_address("ул. Тверская, д. 34"), house)
+        self.assertEqual(
+            canonical_address("ул. Тверская, 34 Д"),
+            canonical_address("ул. Тверская, 34д"),
+        )
+        self.assertEqual(
+            canonical_address("ул. Тверская, 34 г"),
+            canonical_address("ул. Тверская, 34г"),
+        )
+        self.assertNotEqual(canonical_address("ул. Тверская, 34 Д"), house)
+        self.assertNotEqual(canonical_address("ул. Тверская, 34 г"), house)
+
+    def test_д_before_number_is_house(self):
+        self.assertEqual(
+            canonical_address("Москва, мкр 5, д 12"),
+            canonical_address("Москва, мкр 5, дом 12"),
+        )
+        self.assertEqual(canonical_address("мкр 5, д 12"), "микрорайон 5 12")
+
+    def test_every_spelling_of_city_is_dropped(self):
+        keys = {
+            canonical_address(address)
+            for address in ["г. Москва, ул. Тверская, 7", "гор. Москва, ул. Тверская, 7"]
+        }
+
+        self.assertEqual(keys, {"москва улица тверская 7"})
+
+
+class CanonicalLookupTestCase(TestCase):
+
+    def setUp(self):
+        cache.reset_coordinates_cache()
+
+    @patch("geocoder.cache.geocode")
+    def test_variant_spelling_hits_cache(self, mock_geocode):
+        AddressCoordinates.objects.create(
+            address="ул. Партизана Железняка, 34а", latitude=56.05, longitude=92.91
+        )
+
+        coordinates = cache.lookup("улица партизана железняка 34А")
+
+        self.assertEqual(coordinates, (56.05, 92.91))
+        mock_geocode.assert_not_called()
+
+    def test_merge_duplicate_addresses(self):
+        AddressCoordinates.objects.create(address="ул. Ленина, 1")
+        AddressCoordinates.objects.create(
+            address="улица Ленина 1", latitude=55.7, longitude=37.6
+        )
+        AddressCoordinates.objects.create(address="ул. Ленина, 2")
+
+        call_command("merge_duplicate_addresses", stdout=StringIO())
+
+        self.assertEqual(
+            sorted(AddressCoordinates.objects.values_list("address", "latitude")),
+            [("ул. Ленина, 2", None), ("улица Ленина 1", 55.7)],
+        )
+
+
+class TokenBucketTestCase(SimpleTestCase):
+
+    def test_waits_for_tokens(self):
+        self.now = 0
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            self.now += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: self.now, sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertAlmostEqual(sum(sleeps), 1.0)
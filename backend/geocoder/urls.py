@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = "geocoder"
+
+urlpatterns = [
+    path("cache-stats/", views.cache_stats, name="cache_stats"),
+]
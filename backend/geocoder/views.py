@@ -1,3 +1,9 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import user_passes_test
+from django.http import JsonResponse
 
-# Create your views here.
+from geocoder import cache
+
+
+@user_passes_test(lambda user: user.is_staff, login_url="restaurateur:login")
+def cache_stats(request):
+    return JsonResponse(cache.stats())
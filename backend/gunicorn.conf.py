@@ -0,0 +1,56 @@
+"""Настройки gunicorn. Все параметры задаются переменными окружения GUNICORN_*.
+
+По умолчанию используется gthread: медленный запрос к базе или открытый поток
+server-sent events доски заказов занимает один поток, а не весь воркер.
+"""
+
+import multiprocessing
+
+from environs import Env
+
+env = Env()
+env.read_env()
+
+bind = env("GUNICORN_BIND", "0.0.0.0:8000")
+
+# sync, gthread или gevent (для gevent нужны пакеты gevent и psycogreen)
+worker_class = env("GUNICORN_WORKER_CLASS", "gthread")
+workers = env.int("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+threads = env.int("GUNICORN_THREADS", 8)
+worker_connections = env.int("GUNICORN_WORKER_CONNECTIONS", 1000)
+
+# Поток доски заказов живёт ORDER_BOARD_STREAM_TIMEOUT (55 с): sync-воркер
+# всё это время не отчитывается мастеру, поэтому timeout должен быть больше
+timeout = env.int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = env.int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = env.int("GUNICORN_KEEPALIVE", 5)
+
+# Перезапуск воркеров от утечек памяти; разброс, чтобы они не
+# перезапускались все разом
+max_requests = env.int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env.int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# С gevent приложение не загружается в мастере: иначе Django и threading.local
+# метрик импортируются до того, как воркер подменит потоки гринлетами, и все
+# гринлеты воркера делят одно хранилище
+preload_app = worker_class != "gevent" and env.bool("GUNICORN_PRELOAD", True)
+
+accesslog = env("GUNICORN_ACCESS_LOG", "-")
+errorlog = env("GUNICORN_ERROR_LOG", "-")
+loglevel = env("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # С preload_app приложение уже загружено в мастере: прогретые кэши
+    # достанутся воркерам при fork
+    if server.cfg.preload_app:
+        from star_burger.warmup import warm_up
+
+        warm_up()
+
+
+def post_fork(server, worker):
+    if server.cfg.worker_class_str == "gevent":
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
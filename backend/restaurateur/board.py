@@ -0,0 +1,259 @@
+import base64
+import binascii
+import json
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Max, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from foodcartapp.matching import match_orders
+from foodcartapp.models import Order, OrderEvent
+from geocoder.tasks import pending_addresses
+from star_burger import metrics
+
+ORDERS_PER_PAGE = 50
+EVENTS_PER_POLL = 200
+HEARTBEAT_INTERVAL = 15
+RECONNECT_DELAY_MS = 1000
+# Сколько транзакция может держать событие невидимым после вставки
+LATE_EVENT_WINDOW = timedelta(seconds=30)
+# Опросы журнала потоком доски учитываются в метриках под этим именем
+POLL_METRICS_NAME = "restaurateur:order_events:poll"
+# Счётчики по статусам общие для всех потоков, дошедших до одного события
+STATUS_COUNTS_TTL = 5
+# После назначения ресторана статусы не меняются, пересчитывать их незачем
+COUNT_CHANGING_KINDS = {
+    OrderEvent.CREATED,
+    OrderEvent.STATUS_CHANGED,
+    OrderEvent.UPDATED,
+    OrderEvent.DELETED,
+}
+
+
+class BoardQueryError(ValueError):
+    pass
+
+
+def prepare_board_orders(orders):
+    """Добавляет заказам подходящие рестораны и признак ожидания геокодера."""
+    restaurant_matches = match_orders(orders, radius_km=settings.DELIVERY_RADIUS_KM)
+    geocoding_addresses = pending_addresses(
+        order.address for order in orders if order.latitude is None
+    )
+    for order in orders:
+        order.restaurant_distances = restaurant_matches.get(order.id, [])
+        order.geocoding_pending = order.address in geocoding_addresses
+    return orders
+
+
+def load_board_orders(order_ids, status=None):
+    """Заказы order_ids, которые видны на доске со статусом status."""
+    orders = Order.objects.filter(pk__in=order_ids).exclude(status="completed")
+    if status:
+        orders = orders.filter(status=status)
+    return prepare_board_orders(list(orders.select_related("restaurant")))
+
+
+def encode_order_cursor(order):
+    value = f"{order.created_at.isoformat()},{order.pk}"
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_order_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split(",")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BoardQueryError("Некорректный курсор")
+
+
+def get_board_page(status, cursor=None, page_size=ORDERS_PER_PAGE):
+    """Страница заказов со статусом status от новых к старым.
+
+    Возвращает (заказы, курсор следующей страницы или None). Следующая
+    страница выбирается по (created_at, id) последнего заказа, поэтому
+    стоимость запроса не растёт с номером страницы.
+    """
+    orders = Order.objects.filter(status=status).select_related("restaurant")
+    if cursor:
+        orders = orders.older_than(*decode_order_cursor(cursor))
+    else:
+        orders = orders.order_by("-created_at", "-pk")
+    orders = list(orders[: page_size + 1])
+    next_cursor = None
+    if len(orders) > page_size:
+        orders = orders[:page_size]
+        next_cursor = encode_order_cursor(orders[-1])
+    return prepare_board_orders(orders), next_cursor
+
+
+def get_status_tabs():
+    counts = Order.objects.exclude(status="completed").count_by_status()
+    return [
+        {"status": status, "label": label, "count": counts.get(status, 0)}
+        for status, label in Order.STATUS_CHOICES
+        if status in Order.OPEN_STATUSES
+    ]
+
+
+def get_status_counts(event_id=None):
+    """Число открытых заказов по статусам после события event_id.
+
+    Поток доски, дошедший до event_id, берёт счётчики из кэша, если их уже
+    посчитал другой поток. Без event_id счётчики считаются заново.
+    """
+
+    def count():
+        return {tab["status"]: tab["count"] for tab in get_status_tabs()}
+
+    if event_id is None:
+        return count()
+    return cache.get_or_set(f"order_board_counts:{event_id}", count, STATUS_COUNTS_TTL)
+
+
+def get_last_event_id():
+    return OrderEvent.objects.aggregate(last_id=Max("pk"))["last_id"] or 0
+
+
+def render_order_row(order, board_url):
+    return render_to_string("order_row.html", {"order": order, "board_url": board_url})
+
+
+def read_events(cursor, seen):
+    """События после cursor и поздно закоммиченные события до него.
+
+    Номер события выдаётся при вставке, а видно оно после коммита, поэтому
+    событие с меньшим номером может появиться уже после того, как курсор
+    ушёл дальше. Такие события ищутся среди созданных за LATE_EVENT_WINDOW;
+    seen — номера уже отправленных из этого окна, множество обновляется
+    на месте.
+    """
+    recent_ids = set(
+        OrderEvent.objects.filter(
+            pk__lte=cursor, created_at__gte=timezone.now() - LATE_EVENT_WINDOW
+        ).values_list("pk", flat=True)
+    )
+    seen.intersection_update(recent_ids)
+    events = list(
+        OrderEvent.objects.filter(
+            Q(pk__gt=cursor) | Q(pk__in=recent_ids - seen)
+        ).order_by("pk")[:EVENTS_PER_POLL]
+    )
+    seen.update(event.pk for event in events)
+    return events
+
+
+def build_messages(events, cursor, board_url, status=None):
+    """Сообщения доски по событиям events: список пар (id события, данные).
+
+    Несколько событий одного заказа схлопываются в одно сообщение со
+    свежей строкой таблицы и номером последнего события заказа, но не
+    меньше cursor. Для завершённых и удалённых заказов, а также заказов
+    с другим статусом, чем status, html равен None — строку нужно убрать.
+    """
+    last_events = {}
+    for event in events:
+        last_events.pop(event.order_id, None)
+        last_events[event.order_id] = event
+    if not last_events:
+        return []
+
+    orders = {order.id: order for order in load_board_orders(last_events, status)}
+    return [
+        (
+            max(event.pk, cursor),
+            {
+                "id": order_id,
+                "kind": event.kind,
+                "html": (
+                    render_order_row(orders[order_id], board_url)
+                    if order_id in orders
+                    else None
+                ),
+            },
+        )
+        for order_id, event in last_events.items()
+    ]
+
+
+def collect_changes(cursor, board_url, status=None, seen=None):
+    """Изменения заказов после события cursor, см. build_messages.
+
+    Без seen недавние события до cursor отправляются повторно: строка
+    заказа заменяется целиком, так что повтор безвреден.
+    """
+    events = read_events(cursor, set() if seen is None else seen)
+    return build_messages(events, cursor, board_url, status)
+
+
+def poll_changes(cursor, seen, board_url, status=None):
+    """Один опрос журнала для потока доски: (сообщения, счётчики или None).
+
+    Счётчики по статусам возвращаются, только если среди событий есть
+    меняющие статусы. SQL-запросы опроса учитываются в метриках и бюджете
+    под именем POLL_METRICS_NAME.
+    """
+    stats = metrics.RequestStats()
+    started_at = time.perf_counter()
+    counts = None
+    with connection.execute_wrapper(stats.time_query):
+        events = read_events(cursor, seen)
+        messages = build_messages(events, cursor, board_url, status)
+        if any(event.kind in COUNT_CHANGING_KINDS for event in events):
+            # Поздние события меняют счётчики без сдвига курсора,
+            # закэшированные для него счётчики уже устарели
+            has_late_events = any(event.pk <= cursor for event in events)
+            last_event_id = max(event_id for event_id, _ in messages)
+            counts = get_status_counts(None if has_late_events else last_event_id)
+    stats.view_seconds = time.perf_counter() - started_at
+    metrics.observe_view(POLL_METRICS_NAME, stats)
+    return messages, counts
+
+
+def format_event(event_id, name, data):
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"id: {event_id}\nevent: {name}\ndata: {payload}\n\n"
+
+
+def stream_order_events(
+    cursor,
+    board_url,
+    timeout,
+    poll_interval,
+    status=None,
+    clock=time.monotonic,
+    sleep=time.sleep,
+):
+    """Поток server-sent events с изменениями доски заказов.
+
+    Каждые poll_interval секунд читает журнал OrderEvent после cursor
+    и ещё не отправленные поздние события до него.
+    Если в пачке изменений есть события, меняющие статусы, следом
+    отправляет счётчики по статусам.
+    Через timeout секунд поток закрывается, и браузер переподключается
+    с заголовком Last-Event-ID, чтобы соединение не занимало воркер
+    бесконечно.
+    """
+    yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+    deadline = clock() + timeout
+    last_message_at = clock()
+    seen = set()
+    while clock() < deadline:
+        messages, counts = poll_changes(cursor, seen, board_url, status)
+        for cursor, message in messages:
+            yield format_event(cursor, "order", message)
+        if counts is not None:
+            yield format_event(cursor, "counts", counts)
+        if messages:
+            last_message_at = clock()
+            continue
+        if clock() - last_message_at >= HEARTBEAT_INTERVAL:
+            yield ": ping\n\n"
+            last_message_at = clock()
+        sleep(poll_interval)
@@ -1,3 +1,298 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from foodcartapp.assignment import assign_orders
+from foodcartapp.models import (
+    Order,
+    OrderEvent,
+    OrderItem,
+    Product,
+    Restaurant,
+    RestaurantMenuItem,
+)
+from restaurateur.board import (
+    POLL_METRICS_NAME,
+    collect_changes,
+    get_board_page,
+    get_last_event_id,
+    get_status_counts,
+    get_status_tabs,
+    stream_order_events,
+)
+from star_burger.metrics import QueryBudgetExceeded, registry
+
+
+class OrderBoardTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.burger = Product.objects.create(name="Бургер", price=100, image="b.jpg")
+        self.restaurant = Restaurant.objects.create(
+            name="Бургерная", latitude=55.75, longitude=37.62
+        )
+        RestaurantMenuItem.objects.create(restaurant=self.restaurant, product=self.burger)
+        self.cursor = get_last_event_id()
+
+    def create_order(self):
+        order = Order.objects.create(
+            firstname="Иван",
+            lastname="Иванов",
+            phonenumber="+79001234567",
+            address="Москва, Красная площадь, 1",
+        )
+        OrderItem.objects.create(order=order, product=self.burger, fixed_price=100)
+        Order.objects.filter(pk=order.pk).update(latitude=55.74, longitude=37.62)
+        return Order.objects.get(pk=order.pk)
+
+    def kinds(self):
+        return list(
+            OrderEvent.objects.after(self.cursor).values_list("order_id", "kind")
+        )
+
+    def test_changes_are_logged(self):
+        order = self.create_order()
+        order.status = "processing"
+        order.save()
+        other = self.create_order()
+        assign_orders()
+        other_pk = other.pk
+        other.delete()
+
+        self.assertEqual(
+            self.kinds(),
+            [
+                (order.pk, OrderEvent.CREATED),
+                (order.pk, OrderEvent.UPDATED),
+                (order.pk, OrderEvent.STATUS_CHANGED),
+                (other_pk, OrderEvent.CREATED),
+                (other_pk, OrderEvent.UPDATED),
+                (other_pk, OrderEvent.RESTAURANT_ASSIGNED),
+                (other_pk, OrderEvent.UPDATED),
+                (other_pk, OrderEvent.DELETED),
+            ],
+        )
+
+    def test_item_changes_refresh_total(self):
+        order = self.create_order()
+        cursor = get_last_event_id()
+        item = order.items.get()
+        item.quantity = 3
+        item.save()
+
+        (_, data), = collect_changes(cursor, "/manager/orders/")
+
+        self.assertEqual(data["kind"], OrderEvent.UPDATED)
+        self.assertIn("300", data["html"])
+
+    def test_changes_of_one_order_are_merged(self):
+        order = self.create_order()
+        order.status = "processing"
+        order.save()
+        completed = self.create_order()
+        completed.status = "completed"
+        completed.save()
+
+        changes = collect_changes(self.cursor, "/manager/orders/")
+
+        self.assertEqual([data["id"] for _, data in changes], [order.pk, completed.pk])
+        event_ids = [event_id for event_id, _ in changes]
+        self.assertEqual(event_ids, sorted(event_ids))
+        _, data = changes[0]
+        self.assertEqual(data["kind"], OrderEvent.STATUS_CHANGED)
+        self.assertIn(f'data-order-id="{order.pk}"', data["html"])
+        self.assertIn("Бургерная", data["html"])
+        self.assertIsNone(changes[1][1]["html"])
+
+    def test_status_change_leaves_tab(self):
+        order = self.create_order()
+        order.status = "processing"
+        order.save()
+
+        (_, new_tab), = collect_changes(self.cursor, "/manager/orders/", status="new")
+        (_, processing_tab), = collect_changes(
+            self.cursor, "/manager/orders/", status="processing"
+        )
+
+        self.assertIsNone(new_tab["html"])
+        self.assertIn(f'data-order-id="{order.pk}"', processing_tab["html"])
+
+    def test_late_committed_event_is_not_skipped(self):
+        first, second = self.create_order(), self.create_order()
+        OrderEvent.objects.after(self.cursor).delete()
+        OrderEvent.objects.create(pk=self.cursor + 10, order_id=second.pk, kind="status")
+        seen = set()
+
+        (cursor, data), = collect_changes(self.cursor, "/manager/orders/", seen=seen)
+        OrderEvent.objects.create(pk=self.cursor + 5, order_id=first.pk, kind="status")
+        (late_cursor, late_data), = collect_changes(
+            cursor, "/manager/orders/", seen=seen
+        )
+
+        self.assertEqual(data["id"], second.pk)
+        self.assertEqual(late_data["id"], first.pk)
+        self.assertEqual(late_cursor, cursor)
+        self.assertEqual(collect_changes(cursor, "/manager/orders/", seen=seen), [])
+
+    def test_stream_sends_events_then_closes(self):
+        order = self.create_order()
+        self.now = 0
+
+        def sleep(seconds):
+            self.now += seconds
+
+        messages = list(
+            stream_order_events(
+                self.cursor,
+                "/manager/orders/",
+                timeout=20,
+                poll_interval=5,
+                clock=lambda: self.now,
+                sleep=sleep,
+            )
+        )
+
+        self.assertTrue(messages[0].startswith("retry:"))
+        event = messages[1].splitlines()
+        self.assertEqual(event[1], "event: order")
+        self.assertEqual(json.loads(event[2].removeprefix("data: "))["id"], order.pk)
+        self.assertTrue(messages[2].startswith(f"id: {event[0].split()[1]}\nevent: counts"))
+        self.assertIn(": ping\n\n", messages)
+
+    def stream(self, cursor):
+        return list(
+            stream_order_events(
+                cursor,
+                "/manager/orders/",
+                timeout=1,
+                poll_interval=5,
+                clock=lambda: self.now,
+                sleep=lambda seconds: setattr(self, "now", self.now + seconds),
+            )
+        )
+
+    def test_assignment_does_not_resend_counts(self):
+        self.create_order()
+        cursor = get_last_event_id()
+        # Событие создания старше окна поздних событий и не отправляется заново
+        OrderEvent.objects.update(created_at=timezone.now() - timedelta(minutes=1))
+        assign_orders()
+        self.now = 0
+
+        messages = self.stream(cursor)
+
+        self.assertEqual(len(messages), 2)
+        self.assertIn("event: order", messages[1])
+
+    def test_streams_share_status_counts(self):
+        self.create_order()
+        cursor = get_last_event_id()
+
+        counts = get_status_counts(cursor)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_status_counts(cursor), counts)
+        self.assertEqual(counts["new"], 1)
+
+    def test_stream_polls_are_budgeted(self):
+        self.create_order()
+        registry.clear()
+        self.now = 0
+
+        self.stream(self.cursor)
+        with self.settings(QUERY_BUDGETS={POLL_METRICS_NAME: 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.stream(self.cursor)
+
+        # Опрос с изменениями, пустой опрос и опрос сверх бюджета
+        totals = registry.snapshot()[POLL_METRICS_NAME]
+        self.assertEqual(totals["requests"], 3)
+        self.assertEqual(totals["over_budget"], 1)
+        self.assertGreater(totals["queries"], 2)
+
+    def test_board_page_and_stream_endpoint(self):
+        manager = User.objects.create_user("manager", password="secret", is_staff=True)
+        self.client.force_login(manager)
+        order = self.create_order()
+
+        page = self.client.get(reverse("restaurateur:view_orders"))
+        with self.settings(ORDER_BOARD_STREAM_TIMEOUT=0):
+            stream = self.client.get(
+                reverse("restaurateur:order_events"),
+                HTTP_LAST_EVENT_ID=str(self.cursor),
+            )
+
+        self.assertContains(page, f'data-order-id="{order.pk}"')
+        self.assertContains(page, f"after={get_last_event_id()}")
+        self.assertEqual(stream["Content-Type"], "text/event-stream")
+        self.assertEqual(b"".join(stream.streaming_content), b"retry: 1000\n\n")
+
+
+class OrderBoardPagesTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.orders = [
+            Order.objects.create(
+                firstname=f"Клиент {number}",
+                lastname="Иванов",
+                phonenumber="+79001234567",
+                address="Москва, Красная площадь, 1",
+                status="delivery" if number % 2 else "new",
+            )
+            for number in range(7)
+        ]
+        # Одинаковое время создания: порядок внутри страницы решает id
+        Order.objects.update(created_at=timezone.now())
+        manager = User.objects.create_user("manager", password="secret", is_staff=True)
+        self.client.force_login(manager)
+
+    def test_keyset_pages_cover_status(self):
+        delivery = sorted(
+            (order.pk for order in self.orders if order.status == "delivery"),
+            reverse=True,
+        )
+        seen = []
+        cursor = None
+        while True:
+            orders, cursor = get_board_page("delivery", cursor, page_size=2)
+            seen.extend(order.pk for order in orders)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, delivery)
+
+    def test_counts_come_from_one_query(self):
+        with self.assertNumQueries(1):
+            tabs = get_status_tabs()
+
+        self.assertEqual(
+            [(tab["status"], tab["count"]) for tab in tabs],
+            [("new", 4), ("processing", 0), ("restaurant", 0), ("delivery", 3)],
+        )
+
+    def test_board_page(self):
+        response = self.client.get(
+            reverse("restaurateur:view_orders"), {"status": "delivery"}
+        )
 
-# Create your tests here.
+        self.assertEqual(
+            [order.status for order in response.context["orders"]], ["delivery"] * 3
+        )
+        self.assertIsNone(response.context["next_cursor"])
+        self.assertEqual(
+            self.client.get(
+                reverse("restaurateur:view_orders"), {"cursor": "не курсор"}
+            ).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("restaurateur:view_orders"), {"status": "completed"}
+            ).status_code,
+            400,
+        )
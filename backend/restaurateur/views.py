@@ -1,35 +1,30 @@
 from django import forms
+from django.conf import settings
 from django.shortcuts import redirect, render
 
 from django.views import View
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth import authenticate, login
 
 from django.contrib.auth import views as auth_views
-from django.http import JsonResponse
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 
 from foodcartapp.models import Product, Restaurant, Order, OrderItem
-from django.db.models import Sum, F
+from foodcartapp.availability import get_availability_matrix
+from restaurateur.board import (
+    BoardQueryError,
+    get_board_page,
+    get_last_event_id,
+    get_status_tabs,
+    stream_order_events,
+)
 
 from django.shortcuts import get_object_or_404
-from django.db.models.signals import post_save, post_delete
-
-from django.dispatch import receiver
 from django.db import transaction, IntegrityError, DatabaseError
 
 
-@receiver([post_save, post_delete], sender=OrderItem)
-def update_order_total(sender, instance, **kwargs):
-    order = instance.order
-    total = (
-        order.items.aggregate(total=Sum(F("quantity") * F("fixed_price")))["total"] or 0
-    )
-    order.total_price = total
-    order.save()
-
-
 class Login(forms.Form):
     username = forms.CharField(
         label="Логин",
@@ -79,16 +74,11 @@ def is_manager(user):
 @user_passes_test(is_manager, login_url="restaurateur:login")
 def view_products(request):
     restaurants = list(Restaurant.objects.order_by("name"))
-    products = list(Product.objects.prefetch_related("menu_items"))
+    restaurant_ids = [restaurant.id for restaurant in restaurants]
+    availability = get_availability_matrix()
     products_with_restaurant_availability = [
-        (
-            product,
-            [availability.get(restaurant.id, False) for restaurant in restaurants],
-        )
-        for product in products
-        for availability in [
-            {item.restaurant_id: item.availability for item in product.menu_items.all()}
-        ]
+        (product, availability.row(product.id, restaurant_ids))
+        for product in Product.objects.select_related("category")
     ]
     return render(
         request,
@@ -111,17 +101,60 @@ def view_restaurants(request):
     )
 
 
+def get_board_status(request):
+    status = request.GET.get("status", "new")
+    if status not in Order.OPEN_STATUSES:
+        raise BoardQueryError(f"Неизвестный статус: {status}")
+    return status
+
+
 @user_passes_test(is_manager, login_url="restaurateur:login")
 def view_orders(request):
-    orders = Order.objects.exclude(status="completed").prefetch_related(
-        "items__product", "restaurant"
+    last_event_id = get_last_event_id()
+    try:
+        status = get_board_status(request)
+        orders, next_cursor = get_board_page(status, request.GET.get("cursor"))
+    except BoardQueryError as e:
+        return HttpResponseBadRequest(str(e))
+    return render(
+        request,
+        "manager_orders.html",
+        {
+            "orders": orders,
+            "status": status,
+            "status_tabs": get_status_tabs(),
+            "is_first_page": not request.GET.get("cursor"),
+            "next_cursor": next_cursor,
+            "board_url": request.get_full_path(),
+            "last_event_id": last_event_id,
+        },
     )
 
-    for order in orders:
-        order.restaurant_distances = order.get_restaurants_with_distances()
 
-        order.total = order.total_price()
-    return render(request, "manager_orders.html", {"orders": orders})
+@user_passes_test(is_manager, login_url="restaurateur:login")
+def order_events(request):
+    try:
+        status = get_board_status(request)
+    except BoardQueryError as e:
+        return HttpResponseBadRequest(str(e))
+    cursor = request.headers.get("Last-Event-ID") or request.GET.get("after")
+    try:
+        cursor = int(cursor)
+    except (TypeError, ValueError):
+        cursor = get_last_event_id()
+    response = StreamingHttpResponse(
+        stream_order_events(
+            cursor,
+            board_url=f"{reverse('restaurateur:view_orders')}?status={status}",
+            timeout=settings.ORDER_BOARD_STREAM_TIMEOUT,
+            poll_interval=settings.ORDER_BOARD_POLL_INTERVAL,
+            status=status,
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 def create_order_view(request):
@@ -151,9 +184,8 @@ def create_order_view(request):
                         quantity=quantity,
                         fixed_price=fixed_price,
                     )
-                return JsonResponse(
-                    {"order_id": order.id, "total_price": order.total_price()}
-                )
+                order.refresh_from_db(fields=["total"])
+                return JsonResponse({"order_id": order.id, "total_price": order.total})
         except IntegrityError:
             return JsonResponse(
                 {"error": "Произошла ошибка целостности базы данных."}, status=400
@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+# (поле, имя метрики, описание)
+VIEW_METRICS = [
+    ("requests", "star_burger_requests_total", "Обработанные запросы"),
+    ("queries", "star_burger_db_queries_total", "SQL-запросы"),
+    ("db_seconds", "star_burger_db_seconds_total", "Время SQL-запросов, с"),
+    (
+        "geocoder_seconds",
+        "star_burger_geocoder_seconds_total",
+        "Время HTTP-запросов к геокодеру, с",
+    ),
+    ("view_seconds", "star_burger_view_seconds_total", "Время обработки запроса, с"),
+    (
+        "over_budget",
+        "star_burger_query_budget_exceeded_total",
+        "Запросы, превысившие бюджет SQL-запросов",
+    ),
+]
+GEOCODER_CACHE_GAUGES = {"size", "maxsize"}
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.geocoder_seconds = 0.0
+        self.view_seconds = 0.0
+
+    def time_query(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started_at
+
+
+class MetricsRegistry:
+    """Счётчики по представлениям, накопленные с запуска процесса.
+
+    У каждого воркера свой реестр: Prometheus опрашивает их по отдельности
+    и складывает сам.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def observe(self, view_name, stats, over_budget):
+        with self.lock:
+            totals = self.views.setdefault(
+                view_name, dict.fromkeys((field for field, *_ in VIEW_METRICS), 0)
+            )
+            totals["requests"] += 1
+            totals["queries"] += stats.queries
+            totals["db_seconds"] += stats.db_seconds
+            totals["geocoder_seconds"] += stats.geocoder_seconds
+            totals["view_seconds"] += stats.view_seconds
+            totals["over_budget"] += int(over_budget)
+
+    def snapshot(self):
+        with self.lock:
+            return {name: dict(totals) for name, totals in self.views.items()}
+
+    def clear(self):
+        with self.lock:
+            self.views.clear()
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def track_geocoder():
+    """Добавляет время блока к времени геокодера текущего запроса."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = getattr(_local, "stats", None)
+        if stats is not None:
+            stats.geocoder_seconds += time.perf_counter() - started_at
+
+
+def report_over_budget(view_name, queries, budget):
+    """Превышение бюджета SQL-запросов: в тестах исключение, в остальных
+    случаях — предупреждение в лог.
+    """
+    message = f"{view_name}: {queries} SQL-запросов при бюджете {budget}"
+    if settings.QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def observe_view(view_name, stats):
+    """Учитывает запрос в метриках и сверяет его с бюджетом SQL-запросов."""
+    budget = settings.QUERY_BUDGETS.get(view_name)
+    over_budget = budget is not None and stats.queries > budget
+    registry.observe(view_name, stats, over_budget)
+    if over_budget:
+        report_over_budget(view_name, stats.queries, budget)
+
+
+class RequestMetricsMiddleware:
+    """Считает SQL-запросы, время БД, геокодера и обработки запроса
+    по имени представления.
+
+    Тело StreamingHttpResponse отдаётся уже после выхода из middleware,
+    поэтому учитываются только запросы, сделанные до начала потока;
+    запросы внутри потока учитывает сам поток.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        _local.stats = stats
+        started_at = time.perf_counter()
+        try:
+            with connection.execute_wrapper(stats.time_query):
+                response = self.get_response(request)
+        finally:
+            _local.stats = None
+        stats.view_seconds = time.perf_counter() - started_at
+
+        match = request.resolver_match
+        if match is not None:
+            observe_view(match.view_name, stats)
+        return response
+
+
+def escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(views, geocoder_cache_stats):
+    """Метрики в текстовом формате Prometheus."""
+    lines = []
+    for field, name, description in VIEW_METRICS:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} counter")
+        for view_name, totals in sorted(views.items()):
+            lines.append(f'{name}{{view="{escape_label(view_name)}"}} {totals[field]}')
+    for field, value in geocoder_cache_stats.items():
+        if field in GEOCODER_CACHE_GAUGES:
+            name, kind = f"star_burger_geocoder_cache_{field}", "gauge"
+        else:
+            name, kind = f"star_burger_geocoder_cache_{field}_total", "counter"
+        lines.append(f"# HELP {name} Кэш координат геокодера: {field}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -1,6 +1,8 @@
 import os
 import dj_database_url
 
+from datetime import timedelta
+
 from django.http import Http404
 from environs import Env
 
@@ -9,6 +11,16 @@ env.read_env()
 
 YANDEX_GEOCODER_API_KEY = env('YANDEX_GEOCODER_API_KEY')
 
+GEOCODER_BACKEND = env('GEOCODER_BACKEND', 'geocoder.backends.yandex')
+
+GEOCODER_TIMEOUT = env.float('GEOCODER_TIMEOUT', 5)
+
+GEOCODER_CACHE_SIZE = env.int('GEOCODER_CACHE_SIZE', 4096)
+
+GEOCODER_CACHE_TTL = env.int('GEOCODER_CACHE_TTL', 60 * 60)
+
+GEOCODER_NEGATIVE_CACHE_TTL = env.int('GEOCODER_NEGATIVE_CACHE_TTL', 5 * 60)
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -47,6 +59,7 @@ ROLLBAR = {
 }
 
 MIDDLEWARE = [
+    'star_burger.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -100,9 +113,66 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
 DATABASES = {
-    'default': dj_database_url.config(default=env('DATABASE_URL'))
+    'default': dj_database_url.config(
+        default=env('DATABASE_URL'),
+        conn_max_age=env.int('DB_CONN_MAX_AGE', 60),
+        conn_health_checks=env.bool('DB_CONN_HEALTH_CHECKS', True),
+    )
 }
 
+# За pgbouncer в режиме pool_mode=transaction соединение с PostgreSQL
+# меняется между транзакциями, и курсоры на стороне сервера (QuerySet.iterator)
+# теряются — их нужно отключить.
+if env.bool('DB_PGBOUNCER', False):
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+CACHES = {
+    'default': {
+        'BACKEND': env(
+            'CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': env('CACHE_LOCATION', '/tmp/star_burger_cache'),
+    }
+}
+
+CATALOGUE_CACHE_TIMEOUT = env.int('CATALOGUE_CACHE_TIMEOUT', 24 * 60 * 60)
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=env.int('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+
+# Дольше таймаута gunicorn: по его истечении воркер с запросом уже убит
+IDEMPOTENCY_PROCESSING_TIMEOUT = timedelta(
+    seconds=env.int('IDEMPOTENCY_PROCESSING_TIMEOUT', 120)
+)
+
+DELIVERY_RADIUS_KM = env.float('DELIVERY_RADIUS_KM', 30)
+
+ORDER_ASSIGNMENT_RETRY_INTERVAL = timedelta(
+    seconds=env.int('ORDER_ASSIGNMENT_RETRY_INTERVAL', 60)
+)
+
+ORDER_BOARD_POLL_INTERVAL = env.float('ORDER_BOARD_POLL_INTERVAL', 1.0)
+
+ORDER_BOARD_STREAM_TIMEOUT = env.int('ORDER_BOARD_STREAM_TIMEOUT', 55)
+
+METRICS_TOKEN = env('METRICS_TOKEN', '')
+
+QUERY_BUDGETS = env.dict(
+    'QUERY_BUDGETS',
+    {
+        'restaurateur:view_orders': 12,
+        'restaurateur:order_events:poll': 10,
+        'restaurateur:ProductsView': 8,
+        'product_list_api': 4,
+        'order': 20,
+        'orders_batch': 20,
+    },
+    subcast_values=int,
+)
+
+QUERY_BUDGET_STRICT = env.bool('QUERY_BUDGET_STRICT', False)
+
+TEST_RUNNER = 'star_burger.test_runner.QueryBudgetTestRunner'
+
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+# Тесты очищают кэш; с общим файловым кэшем они стёрли бы кэш запущенного сайта
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "star-burger-tests",
+    }
+}
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """В тестах превышение бюджета SQL-запросов роняет тест, а не пишется в лог,
+    а кэш живёт в памяти процесса.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.query_budget_strict = settings.QUERY_BUDGET_STRICT
+        settings.QUERY_BUDGET_STRICT = True
+        self.test_caches = override_settings(CACHES=TEST_CACHES)
+        self.test_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_caches.disable()
+        settings.QUERY_BUDGET_STRICT = self.query_budget_strict
+        super().teardown_test_environment(**kwargs)
@@ -4,13 +4,15 @@ from django.contrib import admin
 from django.shortcuts import render
 from django.urls import path, include
 
-from star_burger import settings
+from star_burger import settings, views
 
 urlpatterns = [
                   path("admin/", admin.site.urls),
                   path("", render, kwargs={"template_name": "index.html"}, name="start_page"),
                   path("api/", include("foodcartapp.urls")),
                   path("manager/", include("restaurateur.urls")),
+                  path("geocoder/", include("geocoder.urls")),
+                  path("metrics", views.metrics, name="metrics"),
               ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 if settings.DEBUG:
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from geocoder import cache as geocoder_cache
+from star_burger.metrics import registry, render_metrics
+
+
+def has_metrics_access(request):
+    """Метрики видят сотрудники и сборщик с токеном METRICS_TOKEN."""
+    if request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    return bool(token) and constant_time_compare(authorization, f"Bearer {token}")
+
+
+def metrics(request):
+    if not has_metrics_access(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_metrics(registry.snapshot(), geocoder_cache.stats()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,30 @@
+import logging
+
+from django.db import DatabaseError, connections
+from django.urls import reverse
+
+from foodcartapp.availability import get_availability_matrix
+from foodcartapp.catalogue import get_catalogue_variants, get_catalogue_version
+from foodcartapp.views import get_banner_variants
+from foodcartapp.zones import get_zone_index
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    """Собирает всё, что иначе собрал бы первый запрос каждого воркера:
+    маршруты, баннеры, каталог, матрицу меню и зоны доставки.
+
+    Вызывается в мастере gunicorn до fork, поэтому соединения с БД
+    после прогрева закрываются — воркеры не должны делить их сокеты.
+    """
+    reverse("start_page")
+    get_banner_variants(False)
+    try:
+        get_catalogue_variants(get_catalogue_version())
+        get_availability_matrix()
+        get_zone_index()
+    except DatabaseError as e:
+        logger.warning(f"Кэши не прогреты: {e}")
+    finally:
+        connections.close_all()